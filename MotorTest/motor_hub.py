@@ -15,7 +15,12 @@ import time
 import struct
 import threading
 import math
+import select
 import signal
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import can
 
 # --- 1. Environment Setup ---
 # Add the SDK path (assuming running from python/ directory)
@@ -25,7 +30,6 @@ sys.path.append('/usr/local/lib/python3/dist-packages')
 
 try:
     from robstride_dynamics import RobstrideBus, Motor, ParameterType, CommunicationType
-    import robstride_dynamics.table as table
 except ImportError as e:
     print(f"❌ Critical Error: Could not import RobStride SDK.")
     print(f"   Details: {e}")
@@ -33,25 +37,32 @@ except ImportError as e:
     sys.exit(1)
 
 # --- 2. RS-02 Parameter Patch (Crucial for correct physics) ---
-RS02_PARAMS = {
-    "rs-02": {
-        "position": 12.57,  # 4 * PI
-        "velocity": 44.0,
-        "torque": 17.0,
-        "kp": 500.0,
-        "kd": 5.0
-    }
-}
-# Apply patch to SDK tables
-table.MODEL_MIT_POSITION_TABLE["rs-02"] = RS02_PARAMS["rs-02"]["position"]
-table.MODEL_MIT_VELOCITY_TABLE["rs-02"] = RS02_PARAMS["rs-02"]["velocity"]
-table.MODEL_MIT_TORQUE_TABLE["rs-02"]   = RS02_PARAMS["rs-02"]["torque"]
-table.MODEL_MIT_KP_TABLE["rs-02"]       = RS02_PARAMS["rs-02"]["kp"]
-table.MODEL_MIT_KD_TABLE["rs-02"]       = RS02_PARAMS["rs-02"]["kd"]
+from robstride_patch import apply as apply_rs02
+apply_rs02()
+
+# The SDK builds the python-can bus itself; defaults in can.rc reach that
+# constructor. Over socketcand, tcp_tune disables Nagle so command frames
+# aren't held back long enough to trip the motor watchdog.
+can.rc["tcp_tune"] = True
 
 # --- 3. Helper: Parameter Map ---
 # Create a dictionary of all available parameters from the SDK for easy menu selection
 PARAM_MAP = {k: v for k, v in vars(ParameterType).items() if not k.startswith('__')}
+PARAM_KEYS = tuple(PARAM_MAP)
+PARAM_MENU = "\n".join(
+    f"  {i+1:2}. {k:<25} (ID: 0x{PARAM_MAP[k][0]:04X}, Type: {PARAM_MAP[k][1].__name__})"
+    for i, k in enumerate(PARAM_KEYS)
+)
+
+# Little-endian value layouts of a READ_PARAMETER reply (bytes 4-7), keyed by dtype name
+PARAM_VALUE_FORMATS = {
+    'uint8': '<B', 'int8': '<b',
+    'uint16': '<H', 'int16': '<h',
+    'uint32': '<L', 'int32': '<l',
+    'float32': '<f',
+}
+PARAM_READ_WINDOW = 8     # Read requests in flight at once during "Read All"
+PARAM_READ_TIMEOUT = 0.1  # Seconds to wait for each reply
 
 class MotorHub:
     def __init__(self, motor_id=127, interface='can0'):
@@ -60,6 +71,8 @@ class MotorHub:
         self.interface = interface
         self.bus = None
         self.connected = False
+        self._tx_pool = None  # MIT mode's TX thread, only while that mode runs
+        self._bus_lock = threading.Lock()
         
     def connect(self):
         print(f"\n🔌 Connecting to Motor ID {self.motor_id} on {self.interface}...")
@@ -74,6 +87,7 @@ class MotorHub:
             self.connected = False
 
     def disconnect(self):
+        self._stop_tx_pool()
         if self.bus:
             print("\n🔌 Disconnecting...")
             try:
@@ -143,16 +157,13 @@ class MotorHub:
         print("\n📖 --- READ PARAMETER ---")
         print("Available Parameters:")
         
-        keys = list(PARAM_MAP.keys())
-        for i, key in enumerate(keys):
-            param_id, dtype, name = PARAM_MAP[key]
-            print(f"  {i+1:2}. {key:<25} (ID: 0x{param_id:04X}, Type: {dtype.__name__})")
+        print(PARAM_MENU)
         
         try:
             idx = int(input("\nSelect parameter number to read (0 to cancel): ")) - 1
             if idx < 0: return
             
-            param_key = keys[idx]
+            param_key = PARAM_KEYS[idx]
             param_tuple = PARAM_MAP[param_key]
             
             print(f"reading {param_key}...")
@@ -164,23 +175,79 @@ class MotorHub:
         except Exception as e:
             print(f"❌ Read Error: {e}")
 
+    def cmd_read_all(self):
+        if not self._check_connection(): return
+        print("\n📖 --- READ ALL PARAMETERS ---")
+
+        # Keep up to PARAM_READ_WINDOW requests on the bus and reap replies as
+        # they arrive, so the round-trips overlap instead of running one after
+        # another. Each parameter succeeds or fails on its own.
+        values = {}
+        todo = deque(PARAM_MAP.items())
+        in_flight = {}  # param_id -> (key, dtype, reply deadline)
+        while todo or in_flight:
+            while todo and len(in_flight) < PARAM_READ_WINDOW:
+                key, (param_id, dtype, _) = todo.popleft()
+                try:
+                    data = struct.pack("<HHL", param_id, 0x00, 0x00)
+                    self.bus.transmit(CommunicationType.READ_PARAMETER, self.bus.host_id, self.motor_id, data)
+                except Exception as e:
+                    values[key] = f"-- error: {e} --"
+                    continue
+                in_flight[param_id] = (key, dtype, time.time() + PARAM_READ_TIMEOUT)
+            if not in_flight:
+                continue
+
+            now = time.time()
+            for param_id, (key, _, deadline) in list(in_flight.items()):
+                if deadline <= now:
+                    values[key] = "-- no reply --"
+                    del in_flight[param_id]
+            if not in_flight:
+                continue
+
+            try:
+                frame = self.bus.receive(timeout=min(d for _, _, d in in_flight.values()) - now)
+            except Exception:
+                # An error/fault frame can't be tied to one request; any
+                # request it belonged to times out on its own.
+                continue
+            if frame is None: continue
+            comm_type, extra_data, host_id, data = frame
+            if comm_type != CommunicationType.READ_PARAMETER or len(data) < 2: continue
+            entry = in_flight.pop(struct.unpack_from("<H", data)[0], None)
+            if entry is None: continue
+            key, dtype, _ = entry
+            fmt = PARAM_VALUE_FORMATS.get(dtype.__name__)
+            if len(data) < 8:
+                values[key] = "-- short reply --"
+            elif fmt is None:
+                values[key] = f"0x{data[4:8].hex()} (raw)"
+            else:
+                values[key] = struct.unpack_from(fmt, data, 4)[0]
+
+        failed = 0
+        for key, (param_id, _, _) in PARAM_MAP.items():
+            val = values[key]
+            failed += isinstance(val, str) and val.startswith("--")
+            print(f"  {key:<25} (ID: 0x{param_id:04X}) = {val}")
+        if failed:
+            print(f"⚠️ {failed} parameter(s) could not be read.")
+
     def cmd_write_parameter(self):
         if not self._check_connection(): return
         print("\n✍️ --- WRITE PARAMETER ---")
         print("⚠️  BE CAREFUL: Writing incorrect values can damage the motor.")
         
-        keys = list(PARAM_MAP.keys())
         # Filter for writable? Protocol doesn't explicitly flag in python struct, 
         # but usually Status/Meas vars are read-only. User discretion advised.
-        for i, key in enumerate(keys):
-            param_id, dtype, name = PARAM_MAP[key]
-            print(f"  {i+1:2}. {key:<25} (ID: 0x{param_id:04X})")
+        print(PARAM_MENU)
             
         try:
             idx = int(input("\nSelect parameter number to write (0 to cancel): ")) - 1
             if idx < 0: return
             
-            param_key = keys[idx]
+            param_key = PARAM_KEYS[idx]
             param_tuple = PARAM_MAP[param_key]
             
             val_str = input(f"Enter new value for {param_key}: ")
@@ -208,6 +275,7 @@ class MotorHub:
         print("  2. Entering interactive loop")
         print("  3. Type 'q' to exit loop")
         
+        self._tx_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mit-tx")
         try:
             self.bus.write(self.motor_name, ParameterType.MODE, 0)
             time.sleep(0.2)
@@ -223,28 +291,27 @@ class MotorHub:
             print("  'p <val>'  -> Set Position (deg)         [e.g. 90]")
             print("  'z'        -> Zero all gains (Limp)")
             
+            # For safety in MIT mode we must keep sending, so keep streaming frames
+            # at full rate and only read stdin once a full line is available.
+            # Commands are applied once typed.
             while True:
-                # Send frame
-                self.bus.write_operation_frame(self.motor_name, pos, kp, kd, 0.0, 0.0)
-                # Read feedback
-                p_fb, v_fb, t_fb, temp = self.bus.read_operation_frame(self.motor_name)
+                p_fb, v_fb, t_fb, temp = self._mit_step(pos, kp, kd)
                 
                 # Print Status
                 status = f"\rStatus: Pos={math.degrees(p_fb):6.1f}° | Trq={t_fb:5.2f}Nm | Cmd: P={math.degrees(pos):.1f}° Kp={kp} Kd={kd}   "
                 sys.stdout.write(status)
                 sys.stdout.flush()
-                
-                # Non-blocking input would be ideal, but for simplicity in this hub
-                # we will use blocking input. This means the motor "holds" last command 
-                # while you type.
-                # To keep the watchdog happy, we'll use a small trick: 
-                # A background thread sending heartbeats could be used, 
-                # but let's just use simple prompt for this educational tool.
-                
-                # Actually, for safety in MIT mode, we must keep sending. 
-                # We will break the live update to ask for input.
                 print("\n")
-                user_in = input("Command > ").strip().lower()
+                sys.stdout.write("Command > ")
+                sys.stdout.flush()
+
+                while not select.select([sys.stdin], [], [], 0)[0]:
+                    self._mit_step(pos, kp, kd)
+                    time.sleep(0.005)
+
+                user_in = sys.stdin.readline()
+                if not user_in: break
+                user_in = user_in.strip().lower()
                 
                 if user_in == 'q': break
                 elif user_in == 'z': 
@@ -266,12 +333,30 @@ class MotorHub:
             print(f"Error: {e}")
         
         # Cleanup
+        self._stop_tx_pool()
         try:
             self.bus.write_operation_frame(self.motor_name, 0, 0, 0, 0, 0)
             self.bus.disable(self.motor_name)
         except: pass
         print("\nExited MIT Mode.")
 
+    def _mit_step(self, pos, kp, kd):
+        # The SDK doesn't document RobstrideBus as thread-safe, so the TX thread
+        # and this one never use it at the same time. The reply only follows
+        # the command anyway, so the read waits for the send to finish.
+        self._tx_pool.submit(self._mit_send, pos, kp, kd).result()
+        with self._bus_lock:
+            return self.bus.read_operation_frame(self.motor_name)
+
+    def _mit_send(self, pos, kp, kd):
+        with self._bus_lock:
+            self.bus.write_operation_frame(self.motor_name, pos, kp, kd, 0.0, 0.0)
+
+    def _stop_tx_pool(self):
+        if self._tx_pool is not None:
+            self._tx_pool.shutdown(wait=True)
+            self._tx_pool = None
+
     def cmd_control_velocity(self):
         if not self._check_connection(): return
         print("\n🏎️ --- VELOCITY CONTROL MODE ---")
@@ -289,16 +374,30 @@ class MotorHub:
             self.bus.enable(self.motor_name)
             print("Motor Enabled.")
             
+            # Wake every 50ms: re-assert the last target to keep the watchdog fed,
+            # and only read stdin once a full line is available.
+            prompt = "\nEnter Target Velocity (rad/s) or 'q' to quit: "
+            last_vel = 0.0
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
             while True:
-                val = input("\nEnter Target Velocity (rad/s) or 'q' to quit: ")
-                if val.lower() == 'q': break
+                rlist, _, _ = select.select([sys.stdin], [], [], 0.05)
+                if not rlist:
+                    self.bus.write(self.motor_name, ParameterType.VELOCITY_TARGET, last_vel)
+                    continue
+
+                val = sys.stdin.readline()
+                if not val or val.strip().lower() == 'q': break
                 
                 try:
                     vel = float(val)
                     self.bus.write(self.motor_name, ParameterType.VELOCITY_TARGET, vel)
+                    last_vel = vel
                     print(f"Velocity set to {vel} rad/s")
                 except ValueError:
                     print("Invalid number.")
+                sys.stdout.write(prompt)
+                sys.stdout.flush()
                     
         except Exception as e:
             print(f"Error: {e}")
@@ -334,6 +433,8 @@ class MotorHub:
             print("--- MOTION MODES ---")
             print("10. MIT Control (Pos + Stiffness)")
             print("11. Velocity Control")
+            print("--- MORE PARAMETERS ---")
+            print("12. Read All Parameters")
             print("--- SYSTEM ---")
             print("0.  Exit")
             print("-"*40)
@@ -351,6 +452,7 @@ class MotorHub:
             elif choice == '9': self.cmd_save_config()
             elif choice == '10': self.cmd_control_mit()
             elif choice == '11': self.cmd_control_velocity()
+            elif choice == '12': self.cmd_read_all()
             elif choice == '0': 
                 self.disconnect()
                 print("Goodbye!")
@@ -0,0 +1,36 @@
+"""
+RS-02 scaling patch for the RobStride SDK.
+
+The SDK's MIT tables define how the 16-bit CAN integers map to real-world
+floats. Call apply() once after the SDK is importable to make sure the RS-02
+entries match the limits below.
+"""
+
+import robstride_dynamics.table as table
+
+# RS02 Motor Limits (Crucial for correct scaling)
+RS02_PARAMS = {
+    "rs-02": {
+        "position": 12.57,  # 4 * PI
+        "velocity": 44.0,
+        "torque": 17.0,
+        "kp": 500.0,
+        "kd": 5.0
+    }
+}
+
+def apply():
+    """Patch the SDK tables with RS02_PARAMS. Safe to call more than once."""
+    params = RS02_PARAMS["rs-02"]
+    if (table.MODEL_MIT_POSITION_TABLE.get("rs-02") == params["position"]
+            and table.MODEL_MIT_VELOCITY_TABLE.get("rs-02") == params["velocity"]
+            and table.MODEL_MIT_TORQUE_TABLE.get("rs-02") == params["torque"]
+            and table.MODEL_MIT_KP_TABLE.get("rs-02") == params["kp"]
+            and table.MODEL_MIT_KD_TABLE.get("rs-02") == params["kd"]):
+        return
+
+    table.MODEL_MIT_POSITION_TABLE["rs-02"] = params["position"]
+    table.MODEL_MIT_VELOCITY_TABLE["rs-02"] = params["velocity"]
+    table.MODEL_MIT_TORQUE_TABLE["rs-02"]   = params["torque"]
+    table.MODEL_MIT_KP_TABLE["rs-02"]       = params["kp"]
+    table.MODEL_MIT_KD_TABLE["rs-02"]       = params["kd"]
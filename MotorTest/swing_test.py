@@ -1,7 +1,13 @@
+import os
 import sys
 import time
+import asyncio
+import ctypes
 import math
 import signal
+import threading
+
+import can
 
 # Adjust path to find the SDK
 sys.path.append('./seeed-projects/robstride_control/RobStride_Control-e0a01d38335972c2fa1dd1e15bb222c4e15e866b/python')
@@ -12,28 +18,52 @@ MOTOR_ID = 127          # Target Motor ID
 INTERFACE = 'can0'      # CAN Interface
 SWING_FREQ = 0.5        # Frequency in Hz (0.5 = 2 seconds per full swing)
 SWING_AMP_DEG = 90.0    # Amplitude in degrees (Swings +/- 90 deg)
+LOOP_DT = 0.02          # Control period in seconds (50Hz)
+RT_CPU = os.environ.get("SWING_RT_CPU")  # CPU to pin the control loop to, e.g. one isolated via isolcpus= (unset: no pinning)
+RT_PRIORITY = 80        # SCHED_FIFO priority for the control loop
+
+# Derived trajectory constants
+AMP_RAD = math.radians(SWING_AMP_DEG)   # Amplitude in radians
+OMEGA = 2 * math.pi * SWING_FREQ        # Angular frequency in rad/s
+RAD2DEG = 180.0 / math.pi
+
+# Status line: time, position (deg), velocity, torque, temperature
+STATUS_FMT = "\r%6.2fs | %8.1f°  | %10.2f   | %8.2f   | %4.1f°C"
+
+# Patch the SDK's MIT scaling table in case RS-02 isn't defined correctly there
+from robstride_patch import apply as apply_rs02
+apply_rs02()
+
+# The SDK builds the python-can bus itself; defaults in can.rc reach that
+# constructor. Over socketcand, tcp_tune disables Nagle so command frames
+# aren't held back long enough to trip the motor watchdog.
+can.rc["tcp_tune"] = True
+
+def setup_realtime():
+    """
+    Pin this thread to RT_CPU (if set), run it at SCHED_FIFO priority and lock
+    memory so page faults can't stall the loop. Needs CAP_SYS_NICE /
+    CAP_IPC_LOCK (e.g. run with sudo); each step that fails is skipped.
+    """
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RT_PRIORITY))
+    except OSError as e:
+        print(f"⚠️ Realtime scheduling unavailable ({e}), continuing without it.")
+
+    if RT_CPU is not None:
+        try:
+            os.sched_setaffinity(0, {int(RT_CPU)})
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not pin to CPU {RT_CPU} ({e}), continuing unpinned.")
+
+    MCL_CURRENT, MCL_FUTURE = 1, 2
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+        print(f"⚠️ mlockall failed ({os.strerror(ctypes.get_errno())}), memory may be paged.")
+
+async def main():
+    setup_realtime()
 
-# RS02 Motor Limits (Crucial for correct scaling)
-# These values define how the 16-bit CAN integers map to real-world floats
-RS02_PARAMS = {
-    "rs-02": {
-        "position": 12.57,  # 4 * PI
-        "velocity": 44.0,
-        "torque": 17.0,
-        "kp": 500.0,
-        "kd": 5.0
-    }
-}
-
-# Monkey-patch the table in the SDK if RS-02 isn't defined correctly there
-import robstride_dynamics.table as table
-table.MODEL_MIT_POSITION_TABLE["rs-02"] = RS02_PARAMS["rs-02"]["position"]
-table.MODEL_MIT_VELOCITY_TABLE["rs-02"] = RS02_PARAMS["rs-02"]["velocity"]
-table.MODEL_MIT_TORQUE_TABLE["rs-02"]   = RS02_PARAMS["rs-02"]["torque"]
-table.MODEL_MIT_KP_TABLE["rs-02"]       = RS02_PARAMS["rs-02"]["kp"]
-table.MODEL_MIT_KD_TABLE["rs-02"]       = RS02_PARAMS["rs-02"]["kd"]
-
-def main():
     print(f"🤖 Connecting to Motor {MOTOR_ID} on {INTERFACE}...")
     
     # Define Motor
@@ -44,12 +74,16 @@ def main():
     bus = RobstrideBus(INTERFACE, motors, {})
     bus.connect(handshake=True)
 
+    loop = asyncio.get_running_loop()
+    rx_stop = threading.Event()
+    rx_thread = None
+
     try:
         # 1. Setup: Enable and Switch to MIT Mode
         print("⚡ Enabling and switching to MIT Mode (Mode 0)...")
         bus.enable(motor_name)
         bus.write(motor_name, ParameterType.MODE, 0) 
-        time.sleep(0.5)
+        await asyncio.sleep(0.5)
 
         # 2. Set Gains (Stiffness & Damping)
         # Kp=40 is stiff enough to move, but soft enough to be safe
@@ -61,54 +95,85 @@ def main():
         print(f"{'TIME':<8} | {'POS (deg)':<10} | {'VEL (rad/s)':<12} | {'TRQ (Nm)':<10} | {'TEMP':<6}")
         print("-" * 60)
 
-        start_time = time.time()
-        
-        while True:
-            # --- A. Calculate Trajectory ---
-            t = time.time() - start_time
-            
-            # Sine Wave: Amp * sin(2 * pi * freq * t)
-            # Result is in Radians
-            target_pos_rad = math.radians(SWING_AMP_DEG) * math.sin(2 * math.pi * SWING_FREQ * t)
-            
-            # Calculate feed-forward velocity (derivative of position) for smoother motion
-            # v = d/dt (A sin(wt)) = A * w * cos(wt)
-            target_vel_rads = math.radians(SWING_AMP_DEG) * (2 * math.pi * SWING_FREQ) * math.cos(2 * math.pi * SWING_FREQ * t)
-
-            # --- B. Send Command (Write) ---
-            # In MIT mode, we send Target Pos, Vel, Kp, Kd, and Feed-Forward Torque
-            bus.write_operation_frame(
-                motor_name,
-                target_pos_rad, 
-                kp, 
-                kd, 
-                target_vel_rads, 
-                0.0 # No extra feed-forward torque
-            )
-
-            # --- C. Read Telemetry (Read) ---
-            # The motor replies to every write with a status frame
-            p_act, v_act, t_act, temp = bus.read_operation_frame(motor_name)
-            
+        # Precompute one full period of the trajectory (the swing is strictly periodic)
+        # Sine Wave: Amp * sin(2 * pi * freq * t)  -> position in Radians
+        # v = d/dt (A sin(wt)) = A * w * cos(wt)   -> feed-forward velocity for smoother motion
+        n_steps = int(round(1.0 / SWING_FREQ / LOOP_DT))
+        pos_tab = [AMP_RAD * math.sin(OMEGA * i * LOOP_DT) for i in range(n_steps)]
+        vel_tab = [AMP_RAD * OMEGA * math.cos(OMEGA * i * LOOP_DT) for i in range(n_steps)]
+
+        # Latest telemetry, shared between the RX callback and the status printer
+        state = {"t": 0.0, "pos": 0.0, "vel": 0.0, "trq": 0.0, "temp": 0.0}
+
+        # --- C. Read Telemetry (Read) ---
+        # The motor replies to every write with a status frame. The SDK read
+        # blocks until one arrives, so it runs on its own thread and never
+        # holds up the event loop; this works on any transport, including
+        # ones without a pollable file descriptor (e.g. socketcand).
+        def rx_loop():
+            while not rx_stop.is_set():
+                try:
+                    p_act, v_act, t_act, temp = bus.read_operation_frame(motor_name)
+                except Exception as e:
+                    if not rx_stop.is_set():
+                        sys.stdout.write(f"\n⚠️ RX error: {e}\n")
+                    rx_stop.wait(0.1)  # don't spin on a persistent error
+                    continue
+                state["pos"], state["vel"], state["trq"], state["temp"] = p_act, v_act, t_act, temp
+
+        rx_thread = threading.Thread(target=rx_loop, name="swing-rx", daemon=True)
+        rx_thread.start()
+
+        async def tx_loop():
+            loop_counter = 0
+            start_time = loop.time()
+            next_tick = start_time
+            while True:
+                # --- A. Look up Trajectory ---
+                i = loop_counter % n_steps
+
+                # --- B. Send Command (Write) ---
+                # In MIT mode, we send Target Pos, Vel, Kp, Kd, and Feed-Forward Torque
+                bus.write_operation_frame(
+                    motor_name,
+                    pos_tab[i], 
+                    kp, 
+                    kd, 
+                    vel_tab[i], 
+                    0.0 # No extra feed-forward torque
+                )
+                state["t"] = loop.time() - start_time
+
+                # Drift-free 50Hz tick so the table index stays in phase
+                loop_counter += 1
+                next_tick += LOOP_DT
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+        async def print_loop():
             # --- D. Print Status ---
-            # Convert act pos to degrees for readability
-            p_deg = math.degrees(p_act)
-            
-            # Print overwriting the same line (or new line if you prefer logs)
+            # Sampled at 10Hz so terminal I/O never stalls the control tick.
             # Using \r to keep the terminal clean, remove it to log history
-            sys.stdout.write(f"\r{t:6.2f}s | {p_deg:8.1f}°  | {v_act:10.2f}   | {t_act:8.2f}   | {temp:4.1f}°C")
-            sys.stdout.flush()
+            while True:
+                sys.stdout.write(STATUS_FMT % (state["t"], state["pos"] * RAD2DEG, state["vel"], state["trq"], state["temp"]))
+                sys.stdout.flush()
+                await asyncio.sleep(0.1)
 
-            # Loop at ~50Hz (20ms)
-            time.sleep(0.02)
+        await asyncio.gather(
+            asyncio.create_task(tx_loop()),
+            asyncio.create_task(print_loop()),
+        )
 
-    except KeyboardInterrupt:
+    except asyncio.CancelledError:
         print("\n\n🛑 Stopping...")
     
     except Exception as e:
         print(f"\n❌ Error: {e}")
 
     finally:
+        # Stop reading telemetry so the shutdown sequence owns the bus again
+        rx_stop.set()
+        if rx_thread is not None:
+            rx_thread.join(timeout=0.5)
         # Safe Shutdown Sequence
         try:
             # 1. Command Zero Position with Zero Gains (Limp)
@@ -122,4 +187,7 @@ def main():
         print("👋 Motor Disabled.")
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
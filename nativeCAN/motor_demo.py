@@ -3,6 +3,13 @@ import time
 import struct
 import math
 
+try:
+    # Optional: compiled command packing for high-rate / multi-motor loops
+    import numpy as np
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Configuration
 CHANNEL = 'can0'
 BITRATE = 1000000  # 1 Mbps
@@ -21,27 +28,37 @@ KD_MAX = 5.0
 T_MIN = -17.0
 T_MAX = 17.0
 
-def float_to_uint(x, x_min, x_max, bits):
-    span = x_max - x_min
-    offset = x_min
-    if x > x_max: x = x_max
-    elif x < x_min: x = x_min
-    return int((x - offset) * ((1 << bits) - 1) / span)
+# Span of each MIT field, for float -> uint encoding
+P_SPAN = P_MAX - P_MIN
+V_SPAN = V_MAX - V_MIN
+KP_SPAN = KP_MAX - KP_MIN
+KD_SPAN = KD_MAX - KD_MIN
+T_SPAN = T_MAX - T_MIN
+
+# Inverse (uint -> float) scale factors for decoding replies
+P_SCALE_16_INV = (P_MAX - P_MIN) / 65535.0
+V_SCALE_12_INV = (V_MAX - V_MIN) / 4095.0
+T_SCALE_12_INV = (T_MAX - T_MIN) / 4095.0
 
-def uint_to_float(x_int, x_min, x_max, bits):
-    span = x_max - x_min
-    offset = x_min
-    return (float(x_int) * span / ((1 << bits) - 1)) + offset
+# Command buffer reused by every pack_cmd() call
+_BUF = bytearray(8)
 
 def pack_cmd(p_des, v_des, kp, kd, t_ff):
     """
     Pack the command into 8 bytes using MIT protocol.
+
+    Returns a shared buffer that is overwritten on the next call, so send it
+    (or copy it) before packing another command.
     """
-    p_int = float_to_uint(p_des, P_MIN, P_MAX, 16)
-    v_int = float_to_uint(v_des, V_MIN, V_MAX, 12)
-    kp_int = float_to_uint(kp, KP_MIN, KP_MAX, 12)
-    kd_int = float_to_uint(kd, KD_MIN, KD_MAX, 12)
-    t_int = float_to_uint(t_ff, T_MIN, T_MAX, 12)
+    # Float -> uint: clamp the float to [min, max], then scale by codes / span
+    # in that order, so each limit maps exactly to its end code (kp=500 -> 4095).
+    # Multiplying by a precomputed codes/span reciprocal instead can land
+    # just below the top code (4094.999...) and truncate to 4094.
+    p_int = int((min(P_MAX, max(P_MIN, p_des)) - P_MIN) * 65535 / P_SPAN)
+    v_int = int((min(V_MAX, max(V_MIN, v_des)) - V_MIN) * 4095 / V_SPAN)
+    kp_int = int((min(KP_MAX, max(KP_MIN, kp)) - KP_MIN) * 4095 / KP_SPAN)
+    kd_int = int((min(KD_MAX, max(KD_MIN, kd)) - KD_MIN) * 4095 / KD_SPAN)
+    t_int = int((min(T_MAX, max(T_MIN, t_ff)) - T_MIN) * 4095 / T_SPAN)
 
     # Packing (Standard MIT/Mini Cheetah format)
     # 0: p_int[15:8]
@@ -52,32 +69,62 @@ def pack_cmd(p_des, v_des, kp, kd, t_ff):
     # 5: kd_int[11:4]
     # 6: kd_int[3:0] | t_int[11:8]
     # 7: t_int[7:0]
-    
-    data = [0] * 8
-    data[0] = (p_int >> 8) & 0xFF
-    data[1] = p_int & 0xFF
-    data[2] = (v_int >> 4) & 0xFF
-    data[3] = ((v_int & 0xF) << 4) | ((kp_int >> 8) & 0xF)
-    data[4] = kp_int & 0xFF
-    data[5] = (kd_int >> 4) & 0xFF
-    data[6] = ((kd_int & 0xF) << 4) | ((t_int >> 8) & 0xF)
-    data[7] = t_int & 0xFF
-    
-    return data
+    struct.pack_into(
+        '>HBBBBBB', _BUF, 0,
+        p_int,
+        v_int >> 4,
+        ((v_int & 0xF) << 4) | (kp_int >> 8),
+        kp_int & 0xFF,
+        kd_int >> 4,
+        ((kd_int & 0xF) << 4) | (t_int >> 8),
+        t_int & 0xFF,
+    )
+
+    return _BUF
+
+if njit is not None:
+    @njit(cache=True)
+    def _to_uint(x, x_min, x_max, max_int):
+        # Same clamp-then-scale order as pack_cmd()
+        return int((min(x_max, max(x_min, x)) - x_min) * max_int / (x_max - x_min))
+
+    @njit(cache=True)
+    def pack_cmd_nb(out, p_des, v_des, kp, kd, t_ff):
+        """
+        Compiled pack_cmd(): writes the 8-byte MIT command into `out`
+        (a uint8 array of length 8) and returns it.
+        """
+        p_int = _to_uint(p_des, P_MIN, P_MAX, 65535)
+        v_int = _to_uint(v_des, V_MIN, V_MAX, 4095)
+        kp_int = _to_uint(kp, KP_MIN, KP_MAX, 4095)
+        kd_int = _to_uint(kd, KD_MIN, KD_MAX, 4095)
+        t_int = _to_uint(t_ff, T_MIN, T_MAX, 4095)
+
+        out[0] = p_int >> 8
+        out[1] = p_int & 0xFF
+        out[2] = v_int >> 4
+        out[3] = ((v_int & 0xF) << 4) | (kp_int >> 8)
+        out[4] = kp_int & 0xFF
+        out[5] = kd_int >> 4
+        out[6] = ((kd_int & 0xF) << 4) | (t_int >> 8)
+        out[7] = t_int & 0xFF
+        return out
 
 def unpack_reply(data):
     """
     Unpack the reply from the motor.
     """
-    id = data[0]
-    p_int = (data[1] << 8) | data[2]
-    v_int = (data[3] << 4) | (data[4] >> 4)
-    t_int = ((data[4] & 0xF) << 8) | data[5]
-    
-    p = uint_to_float(p_int, P_MIN, P_MAX, 16)
-    v = uint_to_float(v_int, V_MIN, V_MAX, 12)
-    t = uint_to_float(t_int, T_MIN, T_MAX, 12)
-    
+    # 0: id, 1-2: p_int, 3-4: v_int[11:0] | t_int[11:8], 5: t_int[7:0]
+    # Uint -> float: code * span / codes + min
+    # unpack_from reads msg.data in place, no bytes copy needed
+    motor_id, p_int, vt_int = struct.unpack_from('>BHH', data)
+    v_int = vt_int >> 4
+    t_int = ((vt_int & 0xF) << 8) | data[5]
+
+    p = p_int * P_SCALE_16_INV + P_MIN
+    v = v_int * V_SCALE_12_INV + V_MIN
+    t = t_int * T_SCALE_12_INV + T_MIN
+
     return p, v, t
 
 def enable_motor(bus, motor_id):
@@ -120,32 +167,45 @@ def main():
 
     print("Starting Motor Demo...")
     
+    # One preallocated frame per motor. Its data is the shared pack_cmd()
+    # buffer, so packing updates the frame in place; re-sending the same
+    # object is safe because socketcan copies it into the kernel in send().
+    tx_msg = can.Message(arbitration_id=MOTOR_ID, data=_BUF, is_extended_id=False, check=False)
+    # The compiled packer, if available, writes through a view of the same bytes
+    nb_buf = np.frombuffer(tx_msg.data, dtype=np.uint8) if njit is not None else None
+    if nb_buf is not None:
+        # Numba compiles on the first call (hundreds of ms); do it now rather
+        # than inside the control loop once the motor is live.
+        print("Compiling command packer...")
+        pack_cmd_nb(nb_buf, 0.0, 0.0, 0.0, 0.0, 0.0)
+
     try:
         enable_motor(bus, MOTOR_ID)
         
         # Spin slowly
         # We use velocity control: p_des=0, v_des=target, kp=0, kd=1.0, t_ff=0
         target_vel = 2.0 # rad/s
-        
+
         start_time = time.time()
         while time.time() - start_time < 5.0: # Run for 5 seconds
-            data = pack_cmd(0.0, target_vel, 0.0, 1.0, 0.0)
-            msg = can.Message(arbitration_id=MOTOR_ID, data=data, is_extended_id=False)
-            bus.send(msg)
+            if nb_buf is not None:
+                pack_cmd_nb(nb_buf, 0.0, target_vel, 0.0, 1.0, 0.0)
+            else:
+                pack_cmd(0.0, target_vel, 0.0, 1.0, 0.0)
+            bus.send(tx_msg)
             
-            # Try to read reply (non-blocking)
-            msg = bus.recv(timeout=0.001)
-            if msg:
+            # Drain every queued reply without blocking
+            msg = bus.recv(timeout=0.0)
+            while msg is not None:
                 # print(f"Received: {msg.data.hex()}")
-                pass
+                msg = bus.recv(timeout=0.0)
                 
             time.sleep(DT)
             
         print("Stopping...")
         # Stop the motor
-        data = pack_cmd(0.0, 0.0, 0.0, 1.0, 0.0)
-        msg = can.Message(arbitration_id=MOTOR_ID, data=data, is_extended_id=False)
-        bus.send(msg)
+        pack_cmd(0.0, 0.0, 0.0, 1.0, 0.0)
+        bus.send(tx_msg)
         time.sleep(0.5)
         
         disable_motor(bus, MOTOR_ID)
@@ -1,4 +1,3 @@
-
 from launch import LaunchDescription
 from launch_ros.actions import Node
 from ament_index_python.packages import get_package_share_directory
@@ -6,11 +5,17 @@ import os
 
 def generate_launch_description():
     share = get_package_share_directory('td_can_bridges')
-    motor_cfg  = os.path.join(share, 'config', 'example_singlebus.yaml')
-    sensor_cfg = os.path.join(share, 'config', 'example_singlebus.yaml')  # duplicate or provide another file
+    # Each bridge is a separate process with its own CAN sockets. To serve
+    # several buses from one process, list them in one config and use
+    # td_can_multibus.launch.py instead (the bridge is an rclpy node, so it
+    # cannot be loaded into an rclcpp component container).
+    # Both bridges share one config (provide separate files for distinct buses).
+    # The bridge parses the YAML itself: nested bus lists aren't valid ROS
+    # parameter values, so the path is passed rather than the parsed dict.
+    cfg_params = {'config': os.path.join(share, 'config', 'example_singlebus.yaml')}
     return LaunchDescription([
         Node(package='td_can_bridges', executable='td_can_bridge', name='motor_can_bridge',
-             output='screen', parameters=[{'config': motor_cfg}]),
+             output='screen', parameters=[cfg_params]),
         Node(package='td_can_bridges', executable='td_can_bridge', name='sensor_can_bridge',
-             output='screen', parameters=[{'config': sensor_cfg}])
+             output='screen', parameters=[cfg_params])
     ])
@@ -1,59 +1,72 @@
 
 #!/usr/bin/env python3
-import argparse, sys, yaml, os
+import argparse, sys, yaml, os, tempfile
 from pathlib import Path
 
+# libyaml-backed loader/dumper when available, pure-Python otherwise
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 DEVICE_TEMPLATES = {
     # Each template returns a list of rx_frame entries to add for this device.
-    # Each entry: (key_name, spec_dict)
+    # Each entry: (key_name, spec_dict); 'dbc_message' names the DBC message the
+    # loader decodes for that entry (must exist in motors.dbc / sensors.dbc).
     'motor_rs02': lambda topic_prefix, id1, id2: [
         (f"RS02_Status1@{id1}", {
             'topic': f"{topic_prefix}/angle_deg",
             'type': 'std_msgs/msg/Float32',
             'fields': {'mech_angle_deg': 'data'},
-            'frame_id': int(id1, 16)
+            'frame_id': int(id1, 16),
+            'dbc_message': 'RS02_Status1'
         }),
         (f"RS02_Status1__vel@{id1}", {
             'topic': f"{topic_prefix}/velocity_rad_s",
             'type': 'std_msgs/msg/Float32',
             'fields': {'mech_velocity_rads': 'data'},
-            'frame_id': int(id1, 16)
+            'frame_id': int(id1, 16),
+            'dbc_message': 'RS02_Status1'
         }),
         (f"RS02_Status1__current@{id1}", {
             'topic': f"{topic_prefix}/phase_current_a",
             'type': 'std_msgs/msg/Float32',
             'fields': {'phase_current_A': 'data'},
-            'frame_id': int(id1, 16)
+            'frame_id': int(id1, 16),
+            'dbc_message': 'RS02_Status1'
         }),
         (f"RS02_Status1__busv@{id1}", {
             'topic': f"{topic_prefix}/bus_voltage_v",
             'type': 'std_msgs/msg/Float32',
             'fields': {'dc_bus_V': 'data'},
-            'frame_id': int(id1, 16)
+            'frame_id': int(id1, 16),
+            'dbc_message': 'RS02_Status1'
         }),
         (f"RS02_Status2__mtemp@{id2}", {
             'topic': f"{topic_prefix}/motor_temp_c",
             'type': 'std_msgs/msg/Float32',
             'fields': {'motor_temp_C': 'data'},
-            'frame_id': int(id2, 16)
+            'frame_id': int(id2, 16),
+            'dbc_message': 'RS02_Status2'
         }),
         (f"RS02_Status2__dtemp@{id2}", {
             'topic': f"{topic_prefix}/driver_temp_c",
             'type': 'std_msgs/msg/Float32',
             'fields': {'driver_temp_C': 'data'},
-            'frame_id': int(id2, 16)
+            'frame_id': int(id2, 16),
+            'dbc_message': 'RS02_Status2'
         }),
         (f"RS02_Status2__faults@{id2}", {
             'topic': f"{topic_prefix}/fault_bits",
             'type': 'std_msgs/msg/UInt32',
             'fields': {'fault_bits': 'data'},
-            'frame_id': int(id2, 16)
+            'frame_id': int(id2, 16),
+            'dbc_message': 'RS02_Status2'
         }),
         (f"RS02_Status2__status@{id2}", {
             'topic': f"{topic_prefix}/status_bits",
             'type': 'std_msgs/msg/UInt32',
             'fields': {'status_bits': 'data'},
-            'frame_id': int(id2, 16)
+            'frame_id': int(id2, 16),
+            'dbc_message': 'RS02_Status2'
         }),
     ],
     # Simple one-frame devices, customize as needed:
@@ -62,7 +75,8 @@ DEVICE_TEMPLATES = {
             'topic': f"{topic_prefix}/force_n",
             'type': 'std_msgs/msg/Float32',
             'fields': {'forceN': 'data'},
-            'frame_id': int(id_hex, 16)
+            'frame_id': int(id_hex, 16),
+            'dbc_message': 'FootForce'
         })
     ],
     'imu': lambda topic_prefix, id_hex: [
@@ -70,7 +84,8 @@ DEVICE_TEMPLATES = {
             'topic': f"{topic_prefix}/temp_c",
             'type': 'std_msgs/msg/Float32',
             'fields': {'temp_C': 'data'},
-            'frame_id': int(id_hex, 16)
+            'frame_id': int(id_hex, 16),
+            'dbc_message': 'IMU_Data'
         })
     ],
     'pdb': lambda topic_prefix, id_hex: [
@@ -78,11 +93,31 @@ DEVICE_TEMPLATES = {
             'topic': f"{topic_prefix}/bus_voltage_v",
             'type': 'std_msgs/msg/Float32',
             'fields': {'bus_V': 'data'},
-            'frame_id': int(id_hex, 16)
+            'frame_id': int(id_hex, 16),
+            'dbc_message': 'PDB_Status'
         })
     ],
 }
 
+def ask(value, prompt):
+    """Return a value given on the command line, or prompt for it."""
+    return value.strip() if value is not None else input(prompt).strip()
+
+def write_config(cfg_path, cfg):
+    """Stream `cfg` to a temp file beside `cfg_path`, then swap it in atomically
+    so an interrupted write never leaves a truncated config behind."""
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{cfg_path.name}.", suffix='.tmp', dir=cfg_path.parent)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            yaml.dump(cfg, f, Dumper=YAML_DUMPER, sort_keys=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, cfg_path.stat().st_mode & 0o7777)
+        os.replace(tmp_name, cfg_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
 def pick_bus(buses, interface):
     for b in buses:
         if b.get('interface') == interface or b.get('name') == interface:
@@ -93,22 +128,31 @@ def main():
     ap = argparse.ArgumentParser(description='Register a CAN node in td_can_bridges config by prompting for ID and device type.')
     ap.add_argument('--config', default=str(Path(__file__).resolve().parents[1] / 'config' / 'example_multibus.yaml'),
                     help='Path to td_can_bridges YAML config to modify.')
+    # Any of these skips the matching prompt, so registration can be scripted.
+    ap.add_argument('--bus', help='Bus name or interface to register on.')
+    ap.add_argument('--device', help='Device type: ' + ' | '.join(DEVICE_TEMPLATES))
+    ap.add_argument('--topic-prefix', help='Topic prefix, e.g. /td/rs02/1.')
+    ap.add_argument('--id1', help='CAN ID (hex) for RS02_Status1 (motor_rs02).')
+    ap.add_argument('--id2', help='CAN ID (hex) for RS02_Status2 (motor_rs02).')
+    ap.add_argument('--id', help='CAN ID (hex) for single-frame devices.')
     args = ap.parse_args()
 
     cfg_path = Path(args.config)
     if not cfg_path.exists():
         sys.exit(f"Config not found: {cfg_path}")
 
-    cfg = yaml.safe_load(cfg_path.read_text())
+    with cfg_path.open('rb') as f:
+        cfg = yaml.load(f, Loader=YAML_LOADER)
     buses = cfg.get('buses', [])
     if not buses:
         sys.exit("No 'buses' in config.")
 
     print("=== td_can_register ===")
-    print("Available buses:")
-    for b in buses:
-        print(f" - name={b.get('name')} interface={b.get('interface')}")
-    interface = input("Enter bus name or interface to register on (e.g., 'motor_bus' or 'can0'): ").strip()
+    if args.bus is None:
+        print("Available buses:")
+        for b in buses:
+            print(f" - name={b.get('name')} interface={b.get('interface')}")
+    interface = ask(args.bus, "Enter bus name or interface to register on (e.g., 'motor_bus' or 'can0'): ")
     bus = None
     for b in buses:
         if b.get('name') == interface or b.get('interface') == interface:
@@ -117,40 +161,25 @@ def main():
     if bus is None:
         sys.exit("No matching bus found.")
 
-    dtype = input("Device type [motor_rs02 | foot_sensor | imu | pdb]: ").strip().lower()
+    dtype = ask(args.device, "Device type [motor_rs02 | foot_sensor | imu | pdb]: ").lower()
     if dtype not in DEVICE_TEMPLATES:
         sys.exit(f"Unsupported device type: {dtype}")
 
-    topic_prefix = input("Topic prefix (e.g., /td/rs02/1): ").strip() or "/td/device"
+    topic_prefix = ask(args.topic_prefix, "Topic prefix (e.g., /td/rs02/1): ") or "/td/device"
 
     if dtype == 'motor_rs02':
-        id1 = input("Enter CAN ID (hex) for RS02_Status1 (e.g., 0x210): ").strip()
-        id2 = input("Enter CAN ID (hex) for RS02_Status2 (e.g., 0x211): ").strip()
+        id1 = ask(args.id1, "Enter CAN ID (hex) for RS02_Status1 (e.g., 0x210): ")
+        id2 = ask(args.id2, "Enter CAN ID (hex) for RS02_Status2 (e.g., 0x211): ")
         entries = DEVICE_TEMPLATES[dtype](topic_prefix, id1, id2)
     else:
-        idx = input("Enter CAN ID (hex) for device (e.g., 0x300): ").strip()
+        idx = ask(args.id, "Enter CAN ID (hex) for device (e.g., 0x300): ")
         entries = DEVICE_TEMPLATES[dtype](topic_prefix, idx)
 
     rx_frames = bus.setdefault('rx_frames', {})
     for key, spec in entries:
-        # Key names must reference existing DBC message names used in mapping;
-        # the key itself is just a label, but we will store a field 'dbc_msg' for clarity.
-        # For compatibility with our parser, the key should be the DBC message name or any label.
-        # We'll ensure DBC messages exist in motors.dbc / sensors.dbc.
-        # Here we embed 'dbc_message' so future tooling can read it (not required by runtime).
-        if 'RS02_Status1' in key:
-            spec['dbc_message'] = 'RS02_Status1'
-        elif 'RS02_Status2' in key:
-            spec['dbc_message'] = 'RS02_Status2'
-        elif 'FootForce' in key:
-            spec['dbc_message'] = 'FootForce'
-        elif 'IMU_Data' in key:
-            spec['dbc_message'] = 'IMU_Data'
-        elif 'PDB_Status' in key:
-            spec['dbc_message'] = 'PDB_Status'
         rx_frames[key] = spec
 
-    cfg_path.write_text(yaml.safe_dump(cfg, sort_keys=False))
+    write_config(cfg_path, cfg)
     print(f"Updated {cfg_path}")
     print("Added rx_frames entries:")
     for k,_ in entries:
@@ -5,7 +5,11 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
+import queue
+import selectors
 import signal
+import socket
 import sys
 from pathlib import Path
 from typing import Any, Dict
@@ -95,6 +99,13 @@ def main(argv: list[str] | None = None) -> int:
     if rx_binding is None:
         parser.error(f"RX binding '{role['rx']}' missing from config {args.config}")
 
+    # The RX thread only queues lines; the main loop prints them, so received
+    # frames never interleave with the prompt mid-write.
+    rx_lines: "queue.SimpleQueue[str]" = queue.SimpleQueue()
+    wake_r, wake_w = socket.socketpair()
+    wake_r.setblocking(False)
+    wake_w.setblocking(False)
+
     def _handle_rx(payload: Dict[str, Any], binding: RxBindingConfig) -> None:
         raw_blink = payload.get("blink", 0)
         raw_seq = payload.get("seq", 0)
@@ -107,11 +118,14 @@ def main(argv: list[str] | None = None) -> int:
         except (TypeError, ValueError):
             seq_value = 0
         state_text = "ON" if blink_value else "OFF"
-        print(
-            f"\n[{role['label']}] Received from {role['peer']}: "
+        rx_lines.put(
+            f"[{role['label']}] Received from {role['peer']}: "
             f"state={state_text} ({blink_value}), seq={seq_value}"
         )
-        print("blink> ", end="", flush=True)
+        try:
+            wake_w.send(b"\0")
+        except BlockingIOError:
+            pass  # a wake-up byte is already pending; the main loop drains all lines
 
     service.register_rx_binding(rx_binding, _handle_rx)
     service.start()
@@ -123,46 +137,80 @@ def main(argv: list[str] | None = None) -> int:
     sequence = 0
     blink_state = 0
     prompt = "blink> "
-    try:
-        while True:
+
+    def _handle_command(line: str) -> bool:
+        """Act on one input line; return False to quit."""
+
+        nonlocal sequence, blink_state
+        line = line.strip().lower()
+        if not line:
+            return True
+        if line in {"quit", "exit"}:
+            return False
+        if line == "toggle":
+            blink_state = 0 if blink_state else 1
+        elif line in {"on", "blink on"}:
+            blink_state = 1
+        elif line in {"off", "blink off"}:
+            blink_state = 0
+        elif line.startswith("blink "):
+            value = line.split(maxsplit=1)[1]
             try:
-                line = input(prompt)
-            except EOFError:
-                line = "quit"
-            line = line.strip().lower()
-            if not line:
-                continue
-            if line in {"quit", "exit"}:
-                break
-            if line == "toggle":
-                blink_state = 0 if blink_state else 1
-            elif line in {"on", "blink on"}:
-                blink_state = 1
-            elif line in {"off", "blink off"}:
-                blink_state = 0
-            elif line.startswith("blink "):
-                value = line.split(maxsplit=1)[1]
-                try:
-                    blink_state = int(value, 0)
-                except ValueError:
-                    print("Invalid value. Use an integer between 0 and 255.")
-                    continue
-                if not 0 <= blink_state <= 255:
-                    print("Value out of range. Use 0-255.")
+                blink_state = int(value, 0)
+            except ValueError:
+                print("Invalid value. Use an integer between 0 and 255.")
+                return True
+            if not 0 <= blink_state <= 255:
+                print("Value out of range. Use 0-255.")
+                return True
+        else:
+            print("Commands: on, off, blink <0-255>, toggle, quit")
+            return True
+
+        sequence = (sequence + 1) % 256
+        payload = {"blink": blink_state, "seq": sequence}
+        log.debug("Sending %s with payload %s", role["tx"], payload)
+        try:
+            service.send(role["tx"], payload)
+        except Exception as exc:  # pragma: no cover - depends on runtime
+            log.error("Failed to send frame: %s", exc)
+        return True
+
+    stdin_fd = sys.stdin.fileno()
+    selector = selectors.DefaultSelector()
+    selector.register(stdin_fd, selectors.EVENT_READ, "stdin")
+    selector.register(wake_r, selectors.EVENT_READ, "rx")
+    pending = b""
+    running = True
+    print(prompt, end="", flush=True)
+    try:
+        while running:
+            for key, _ in selector.select():
+                if key.data == "rx":
+                    wake_r.recv(4096)
+                    while not rx_lines.empty():
+                        # Clear the prompt line, print the frame, redraw the prompt.
+                        sys.stdout.write("\r\033[K" + rx_lines.get() + "\n")
+                    sys.stdout.write(prompt)
+                    sys.stdout.flush()
                     continue
-            else:
-                print("Commands: on, off, blink <0-255>, toggle, quit")
-                continue
 
-            sequence = (sequence + 1) % 256
-            payload = {"blink": blink_state, "seq": sequence}
-            log.debug("Sending %s with payload %s", role["tx"], payload)
-            try:
-                service.send(role["tx"], payload)
-            except Exception as exc:  # pragma: no cover - depends on runtime
-                log.error("Failed to send frame: %s", exc)
+                chunk = os.read(stdin_fd, 4096)
+                if not chunk:
+                    running = False  # EOF
+                    break
+                pending += chunk
+                while running and b"\n" in pending:
+                    line, pending = pending.split(b"\n", 1)
+                    running = _handle_command(line.decode(errors="replace"))
+                if running:
+                    print(prompt, end="", flush=True)
     finally:
+        # Stop the RX thread before closing the socketpair it writes to.
         service.shutdown()
+        selector.close()
+        wake_r.close()
+        wake_w.close()
     return 0
 
 
@@ -5,8 +5,11 @@ from .service import (
     BusConfig,
     CanBusService,
     RxBindingConfig,
+    SharedRxLoop,
     TxBindingConfig,
+    clear_config_cache,
     load_bridge_config,
+    load_dbc,
 )
 
 __all__ = [
@@ -14,7 +17,10 @@ __all__ = [
     "BusConfig",
     "CanBusService",
     "RxBindingConfig",
+    "SharedRxLoop",
     "TxBindingConfig",
+    "clear_config_cache",
     "load_bridge_config",
+    "load_dbc",
 ]
 
@@ -1,9 +1,19 @@
 import rclpy
 from pathlib import Path
+from rclpy.logging import LoggingSeverity
 from rclpy.node import Node
 
 from .bus_worker import BusWorker
-from .service import load_bridge_config
+from .service import SharedRxLoop, load_bridge_config
+
+_LEVELS = {
+    'DEBUG': LoggingSeverity.DEBUG,
+    'INFO': LoggingSeverity.INFO,
+    'WARN': LoggingSeverity.WARN,
+    'WARNING': LoggingSeverity.WARN,
+    'ERROR': LoggingSeverity.ERROR,
+    'FATAL': LoggingSeverity.FATAL,
+}
 
 
 class TDCANBridge(Node):
@@ -24,8 +34,7 @@ class TDCANBridge(Node):
         # Optional global logging level
         log_cfg = self.bridge_cfg.logging
         if log_cfg.get('level'):
-            level_name = log_cfg['level'].upper()
-            level = getattr(rclpy.logging.LoggingSeverity, level_name, rclpy.logging.LoggingSeverity.INFO)
+            level = _LEVELS.get(log_cfg['level'].upper(), LoggingSeverity.INFO)
             self.get_logger().set_level(level)
 
         self.workers = []
@@ -35,12 +44,17 @@ class TDCANBridge(Node):
             raise RuntimeError("Config has no 'buses' entries.")
 
         for bus_cfg in buses:
-            worker = BusWorker(self, bus_cfg, self.bridge_cfg.qos)
+            worker = BusWorker(self, bus_cfg, self.bridge_cfg.qos, start_rx=False)
             self.workers.append(worker)
 
+        # One RX thread for all buses instead of one per bus.
+        self.rx_loop = SharedRxLoop(worker.service for worker in self.workers)
+        self.rx_loop.start()
+
         self.get_logger().info(f"td_can_bridge started with {len(self.workers)} bus(es).")
 
     def destroy_node(self):
+        self.rx_loop.shutdown()
         for worker in self.workers:
             worker.shutdown()
         super().destroy_node()
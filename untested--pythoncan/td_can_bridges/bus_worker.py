@@ -16,7 +16,9 @@ def make_qos(profile_dict, default_depth=10):
 class BusWorker:
     """Owns one SocketCAN channel, bidirectional ROS<->CAN mapping, and health."""
 
-    def __init__(self, node, cfg: BusConfig, qos_defaults):
+    __slots__ = ('node', 'cfg', 'name', 'service', 'tx_bindings', 'rx_bindings', 'rx_guard')
+
+    def __init__(self, node, cfg: BusConfig, qos_defaults, start_rx: bool = True):
         self.node = node
         self.cfg = cfg
         self.name = cfg.name
@@ -26,8 +28,7 @@ class BusWorker:
         # Build TX bindings (ROS -> CAN)
         self.tx_bindings = []
         for key, binding in cfg.tx_bindings.items():
-            metadata = dict(binding.metadata)
-            qos_name = metadata.get('qos', 'command')
+            qos_name = binding.metadata.get('qos', 'command')
             qos = make_qos(qos_defaults.get(qos_name, {}), default_depth=10)
             self.tx_bindings.append(TopicTxBinding(self.node, self.service, binding, qos))
 
@@ -37,15 +38,34 @@ class BusWorker:
             qos = make_qos(qos_defaults.get('sensor', {}), default_depth=20)
             self.rx_bindings.append(RxBinding(self.node, self.service, binding, qos))
 
-        self.service.start()
+        # With an RX queue, publish from the executor rather than the RX thread;
+        # the RX thread triggers the guard condition whenever it queues a frame.
+        self.rx_guard = None
+        if cfg.rx_queue:
+            self.rx_guard = self.node.create_guard_condition(self._drain_rx)
+            self.service.set_rx_notify(self.rx_guard.trigger)
+
+        # Leave RX to the caller when it serves several buses from one thread.
+        if start_rx:
+            self.service.start()
         self.node.get_logger().info(
             f"[{self.name}] up on {self.cfg.interface}, bitrate={self.cfg.bitrate}, "
             f"fd={self.cfg.fd}, dbitrate={self.cfg.dbitrate}"
         )
 
+    def _drain_rx(self, max_items=256):
+        # Triggers that land before the executor wakes are coalesced, so
+        # re-arm while a full batch suggests more frames are still queued.
+        if self.service.drain(max_items) == max_items:
+            self.rx_guard.trigger()
+
     def shutdown(self):
         for binding in self.rx_bindings:
             binding.shutdown()
         for binding in self.tx_bindings:
             binding.shutdown()
         self.service.shutdown()
+        if self.rx_guard:
+            self.service.set_rx_notify(None)
+            self.node.destroy_guard_condition(self.rx_guard)
+            self.rx_guard = None
@@ -0,0 +1,244 @@
+"""Specialized DBC frame codecs.
+
+cantools interprets a message's signal table on every ``encode``/``decode``
+call. For the simple layouts most devices use, the shape of a frame is fixed
+when a binding is created, so this module generates a small Python function
+per message with every offset, mask, scale and offset inlined as constants.
+
+Both compilers return ``None`` for layouts they do not handle (multiplexed or
+container messages, value tables, and float signals that are not byte
+aligned); callers then keep using cantools. Generated codecs produce the same
+values, key order and types as ``msg_def.decode``/``msg_def.encode``.
+
+A frame is only a few shifts and multiplies, so a JIT kernel (e.g. Numba)
+loses more to call dispatch and dict <-> array marshalling than it saves;
+generated Python is the faster option at this size.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from cantools.database.errors import DecodeError
+
+# struct format codes for byte-aligned integer and float signals, by bit length.
+_STRUCT_INT_CODES = {8: "B", 16: "H", 32: "I", 64: "Q"}
+_STRUCT_FLOAT_CODES = {32: "f", 64: "d"}
+
+Decoder = Callable[[Any], Dict[str, Any]]
+Encoder = Callable[[Any], Optional[bytes]]
+
+
+def _is_simple(msg_def) -> bool:
+    return not (msg_def.is_container or msg_def.is_multiplexed()) and not any(
+        sig.choices for sig in msg_def.signals
+    )
+
+
+def _be_shift(sig, length_bytes: int) -> int:
+    """Right shift that isolates a big-endian signal in the frame read as a
+    big-endian integer."""
+
+    msb = (sig.start // 8) * 8 + (7 - sig.start % 8)
+    return length_bytes * 8 - (msb + sig.length)
+
+
+def _scaled(name: str, sig) -> str:
+    if sig.scale == 1 and sig.offset == 0:
+        return name
+    conv = sig.conversion
+    return f"{name} * {conv.scale!r} + {conv.offset!r}"
+
+
+def _result_items(msg_def, exprs: Dict[str, str], signal_to_alias: Mapping[str, str]) -> str:
+    if signal_to_alias:
+        items = [(alias, exprs.get(signal, "None")) for signal, alias in signal_to_alias.items()]
+    else:
+        items = [(sig.name, exprs[sig.name]) for sig in msg_def.signals]
+    return ", ".join(f"{key!r}: {expr}" for key, expr in items)
+
+
+def _build(source: str, name: str, namespace: Dict[str, Any]) -> Callable:
+    exec(source, namespace)
+    return namespace[name]
+
+
+def _compile_struct_decoder(msg_def, signal_to_alias: Mapping[str, str]) -> Optional[Decoder]:
+    # Byte-aligned little-endian signals (including floats): one unpack_from.
+    layout = []
+    for sig in msg_def.signals:
+        codes = _STRUCT_FLOAT_CODES if sig.is_float else _STRUCT_INT_CODES
+        code = codes.get(sig.length)
+        if code is None or sig.byte_order != "little_endian" or sig.start % 8:
+            return None
+        if sig.is_signed and not sig.is_float:
+            code = code.lower()
+        layout.append((sig.start // 8, sig.length // 8, code, sig))
+    layout.sort(key=lambda item: item[0])
+
+    fmt = "<"
+    pos = 0
+    for offset, size, code, _ in layout:
+        if offset < pos:
+            return None  # overlapping signals
+        fmt += "x" * (offset - pos) + code
+        pos = offset + size
+    if pos > msg_def.length:
+        return None
+    # Pad to the DBC length so short frames fail like they do in cantools.
+    fmt += "x" * (msg_def.length - pos)
+
+    names = [f"v{idx}" for idx in range(len(layout))]
+    exprs = {sig.name: _scaled(name, sig) for name, (_, _, _, sig) in zip(names, layout)}
+    unpack = "".join(f"{name}, " for name in names)
+    length = msg_def.length
+    source = (
+        "def decode(data, _unpack_from=_unpack_from):\n"
+        "    try:\n"
+        f"        {unpack}= _unpack_from(data)\n"
+        "    except _StructError:\n"
+        f"        raise _DecodeError(f'Wrong data size: {{len(data)}} instead of {length} bytes') from None\n"
+        f"    return {{{_result_items(msg_def, exprs, signal_to_alias)}}}\n"
+    )
+    namespace = {
+        "_unpack_from": struct.Struct(fmt).unpack_from,
+        "_StructError": struct.error,
+        "_DecodeError": DecodeError,
+    }
+    return _build(source, "decode", namespace)
+
+
+def _compile_word_decoder(msg_def, signal_to_alias: Mapping[str, str]) -> Optional[Decoder]:
+    # Any bit layout of integer signals: read the frame as one little- and/or
+    # big-endian integer and shift/mask each signal out of it.
+    if any(sig.is_float for sig in msg_def.signals):
+        return None
+
+    length = msg_def.length
+    lines: List[str] = [
+        f"    if len(data) < {length}:",
+        f"        raise _DecodeError(f'Wrong data size: {{len(data)}} instead of {length} bytes')",
+    ]
+    if any(sig.byte_order == "little_endian" for sig in msg_def.signals):
+        lines.append(f"    le = _from_bytes(data[:{length}], 'little')")
+    if any(sig.byte_order != "little_endian" for sig in msg_def.signals):
+        lines.append(f"    be = _from_bytes(data[:{length}], 'big')")
+
+    exprs = {}
+    for idx, sig in enumerate(msg_def.signals):
+        name = f"v{idx}"
+        if sig.byte_order == "little_endian":
+            word, shift = "le", sig.start
+        else:
+            word, shift = "be", _be_shift(sig, length)
+        if shift < 0 or shift + sig.length > length * 8:
+            return None
+        lines.append(f"    {name} = {word} >> {shift} & {(1 << sig.length) - 1:#x}")
+        if sig.is_signed:
+            lines.append(f"    if {name} & {1 << (sig.length - 1):#x}:")
+            lines.append(f"        {name} -= {1 << sig.length:#x}")
+        exprs[sig.name] = _scaled(name, sig)
+
+    source = (
+        "def decode(data, _from_bytes=int.from_bytes):\n"
+        + "\n".join(lines)
+        + f"\n    return {{{_result_items(msg_def, exprs, signal_to_alias)}}}\n"
+    )
+    return _build(source, "decode", {"_DecodeError": DecodeError})
+
+
+def compile_decoder(msg_def, signal_to_alias: Mapping[str, str]) -> Optional[Decoder]:
+    """Return ``decode(data) -> dict`` for ``msg_def``, or ``None``.
+
+    Keys are the aliases from ``signal_to_alias`` (signals without an alias are
+    skipped, aliases without a signal map to ``None``), or every signal name
+    when no aliases are given.
+    """
+
+    if not _is_simple(msg_def):
+        return None
+    return _compile_struct_decoder(msg_def, signal_to_alias) or _compile_word_decoder(
+        msg_def, signal_to_alias
+    )
+
+
+def compile_encoder(msg_def, order: Optional[Sequence[str]] = None) -> Optional[Encoder]:
+    """Return ``encode(values) -> bytes`` for ``msg_def``, or ``None``.
+
+    ``values`` maps every signal name to a number or, when ``order`` lists
+    the signal names, is a sequence of numbers in that order. The generated
+    function returns ``None`` instead of raising when a value is missing,
+    unknown, non-numeric or out of range, so the caller can hand that payload
+    to ``msg_def.encode`` for cantools' own validation and error message.
+    """
+
+    if not msg_def.signals or not _is_simple(msg_def) or any(sig.is_float for sig in msg_def.signals):
+        return None
+
+    length = msg_def.length
+    signals = msg_def.signals
+    namespace: Dict[str, Any] = {"_Number": (int, float)}
+    lines: List[str] = [
+        f"    if len(values) != {len(signals)}:",
+        "        return None",
+    ]
+    if order is None:
+        lines.append("    try:")
+        lines += [f"        v{idx} = values[{sig.name!r}]" for idx, sig in enumerate(signals)]
+        lines += ["    except KeyError:", "        return None"]
+    else:
+        index = {sig.name: idx for idx, sig in enumerate(signals)}
+        if sorted(order) != sorted(index):
+            return None
+        lines.append("    " + "".join(f"v{index[name]}, " for name in order) + "= values")
+
+    le_terms: List[str] = []
+    be_terms: List[str] = []
+    for idx, sig in enumerate(signals):
+        name, raw = f"v{idx}", f"r{idx}"
+        if sig.byte_order == "little_endian":
+            terms, shift = le_terms, sig.start
+        else:
+            terms, shift = be_terms, _be_shift(sig, length)
+        if shift < 0 or shift + sig.length > length * 8:
+            return None
+
+        lines.append(f"    if not isinstance({name}, _Number):")
+        lines.append("        return None")
+        # Same range check as cantools' strict mode, including its tolerance.
+        tolerance = abs(sig.conversion.scale) * 1e-6
+        if sig.minimum is not None:
+            lines.append(f"    if not {name} >= {sig.minimum - tolerance!r}:")
+            lines.append("        return None")
+        if sig.maximum is not None:
+            lines.append(f"    if not {name} <= {sig.maximum + tolerance!r}:")
+            lines.append("        return None")
+
+        namespace[f"_to_raw{idx}"] = sig.conversion.numeric_scaled_to_raw
+        lines.append(f"    {raw} = _to_raw{idx}({name})")
+        if sig.is_signed:
+            low, high = -(1 << (sig.length - 1)), (1 << (sig.length - 1)) - 1
+        else:
+            low, high = 0, (1 << sig.length) - 1
+        lines.append(f"    if not {low} <= {raw} <= {high}:")
+        lines.append("        return None")
+        terms.append(f"({raw} & {(1 << sig.length) - 1:#x}) << {shift}")
+
+    le_word = " | ".join(le_terms) or "0"
+    be_word = " | ".join(be_terms) or "0"
+    if not be_terms:
+        lines.append(f"    return ({le_word}).to_bytes({length}, 'little')")
+    elif not le_terms:
+        lines.append(f"    return ({be_word}).to_bytes({length}, 'big')")
+    else:
+        lines.append(
+            f"    le = int.from_bytes(({le_word}).to_bytes({length}, 'little'), 'big')"
+        )
+        lines.append(f"    return (le | {be_word}).to_bytes({length}, 'big')")
+
+    source = "def encode(values):\n" + "\n".join(lines) + "\n"
+    return _build(source, "encode", namespace)
+
+
+__all__ = ["compile_decoder", "compile_encoder"]
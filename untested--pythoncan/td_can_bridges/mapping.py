@@ -1,4 +1,6 @@
 
+import functools
+import operator
 from importlib import import_module
 from typing import Any, Dict
 
@@ -10,7 +12,11 @@ from .service import CanBusService, TxBindingConfig, RxBindingConfig
 def resolve_ros_type(ros_type_str, default='std_msgs/msg/Float32'):
     """Resolve a ROS 2 message type string like ``std_msgs/msg/Float32``."""
 
-    typename = ros_type_str or default
+    return _resolve_ros_type(ros_type_str or default)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_ros_type(typename):
     parts = typename.split('/')
     if len(parts) != 3 or parts[1] != 'msg':
         raise ValueError(f"Invalid ROS type string: {typename}")
@@ -20,48 +26,94 @@ def resolve_ros_type(ros_type_str, default='std_msgs/msg/Float32'):
     return getattr(m, cls)
 
 
+def _build_payload_getter(names):
+    """Return ``get(msg) -> dict`` reading the fixed attributes ``names``."""
+
+    if len(names) == 1:
+        (name,) = names
+        get_one = operator.attrgetter(name)
+        return lambda msg: {name: get_one(msg)}
+    get_all = operator.attrgetter(*names)
+    return lambda msg: dict(zip(names, get_all(msg)))
+
+
+def _build_vector_getter(names):
+    """Return ``get(msg) -> tuple`` reading the fixed attributes ``names``."""
+
+    if len(names) == 1:
+        get_one = operator.attrgetter(names[0])
+        return lambda msg: (get_one(msg),)
+    return operator.attrgetter(*names)
+
+
+def _dynamic_payload(ros_msg):
+    payload = dict(ros_msg.__dict__)
+    if not payload and hasattr(ros_msg, 'data'):
+        payload['data'] = ros_msg.data
+    return payload
+
+
 class TopicTxBinding:
-    """ROS → CAN: subscribe to a ROS topic and pack to a DBC frame."""
+    """ROS → CAN: subscribe to a ROS topic and pack to a DBC frame.
+
+    When the message fields cover exactly the binding's fields, values are
+    read positionally and sent with :meth:`CanBusService.send_vector`, so no
+    payload dict is built per message.
+    """
+
+    __slots__ = ('node', 'service', 'binding', 'msg_def', 'topic', 'subscription', '_log', '_get_payload', '_send')
 
     def __init__(self, node, service: CanBusService, binding: TxBindingConfig, qos_profile: QoSProfile):
         self.node = node
         self.service = service
         self.binding = binding
-        self.service.register_tx_binding(binding)
-        self.msg_def = service.dbc.get_message_by_name(binding.message)
+        encoder = self.service.register_tx_binding(binding)
+        self.msg_def = encoder.msg_def
 
-        metadata = dict(binding.metadata)
-        self.topic = metadata.get('topic', binding.key)
-        msg_type = resolve_ros_type(metadata.get('type', 'std_msgs/msg/Float32'))
+        self.topic = binding.metadata.get('topic', binding.key)
+        msg_type = resolve_ros_type(binding.metadata.get('type', 'std_msgs/msg/Float32'))
+        self._log = node.get_logger()
+        self._send = service.send
+        self._get_payload = self._resolve_payload_getter(msg_type, encoder.field_order)
 
         self.subscription = node.create_subscription(msg_type, self.topic, self._cb, qos_profile)
-        node.get_logger().info(
+        self._log.info(
             f"TX bind: {self.topic} -> DBC:{self.msg_def.name} (id=0x{self.msg_def.frame_id:X})"
         )
 
-    def _cb(self, ros_msg):
-        payload: Dict[str, Any] = {}
+    def _resolve_payload_getter(self, msg_type, field_order):
+        # The message type is fixed per topic, so work out once which fields
+        # make up the payload instead of probing every message.
+        sample = msg_type()
         if self.binding.fields:
-            for ros_field in self.binding.fields.keys():
-                if not hasattr(ros_msg, ros_field):
-                    self.node.get_logger().error(
-                        f"Message on {self.topic} missing field '{ros_field}'",
-                        throttle_duration_sec=5.0,
-                    )
-                    return
-                payload[ros_field] = getattr(ros_msg, ros_field)
-        elif hasattr(ros_msg, '__slots__'):
-            payload = {slot: getattr(ros_msg, slot) for slot in ros_msg.__slots__ if not slot.startswith('_')}
-        elif hasattr(ros_msg, '__dict__'):
-            payload = dict(ros_msg.__dict__)
-
-        if not payload and hasattr(ros_msg, 'data'):
-            payload['data'] = getattr(ros_msg, 'data')
+            names = tuple(self.binding.fields.keys())
+            missing = [name for name in names if not hasattr(sample, name)]
+            if missing:
+                self._log.error(f"Messages on {self.topic} have no field(s) {missing}; nothing will be sent")
+                return None
+        elif hasattr(sample, '__slots__'):
+            names = tuple(slot for slot in sample.__slots__ if not slot.startswith('_'))
+        else:
+            return _dynamic_payload
+
+        if not names and hasattr(sample, 'data'):
+            names = ('data',)
+        if not names:
+            return lambda msg: {}
+        if set(names) == set(field_order) and len(names) == len(field_order):
+            self._send = self.service.send_vector
+            return _build_vector_getter(field_order)
+        return _build_payload_getter(names)
 
+    def _cb(self, ros_msg):
+        if self._get_payload is None:
+            return
         try:
-            self.service.send(self.binding.key, payload)
+            self._send(self.binding.key, self._get_payload(ros_msg))
         except Exception as exc:
-            self.node.get_logger().error(
+            # Encoding errors (and bus errors on unqueued buses) land here;
+            # with a TX queue the service's sender thread reports bus errors.
+            self._log.error(
                 f"Failed to send CAN frame for topic {self.topic}: {exc}",
                 throttle_duration_sec=5.0,
             )
@@ -72,36 +124,66 @@ class TopicTxBinding:
             self.subscription = None
 
 
+def _build_single_data_setter(key):
+    """Return ``apply(payload, msg)`` that copies ``payload[key]`` to ``msg.data``."""
+
+    def apply(payload, msg):
+        msg.data = payload[key]
+
+    return apply
+
+
+def _build_multi_field_setter(fields):
+    """Return ``apply(payload, msg)`` that copies each of ``fields`` onto ``msg``."""
+
+    def apply(payload, msg):
+        for field in fields:
+            setattr(msg, field, payload[field])
+
+    return apply
+
+
 class RxBinding:
     """CAN → ROS: decode a DBC frame and publish to a ROS topic."""
 
+    __slots__ = (
+        'node', 'service', 'binding', 'topic', 'msg_type', 'pub', 'msg_def', 'frame_id',
+        '_apply', '_msg_cls', '_pub_publish',
+    )
+
     def __init__(self, node, service: CanBusService, binding: RxBindingConfig, qos_profile: QoSProfile):
         self.node = node
         self.service = service
         self.binding = binding
 
-        metadata = dict(binding.metadata)
-        self.topic = metadata.get('topic', binding.key)
-        msg_type = resolve_ros_type(metadata.get('type', 'std_msgs/msg/Float32'))
+        self.topic = binding.metadata.get('topic', binding.key)
+        msg_type = resolve_ros_type(binding.metadata.get('type', 'std_msgs/msg/Float32'))
         self.msg_type = msg_type
         self.pub = node.create_publisher(msg_type, self.topic, qos_profile)
 
-        service.register_rx_binding(binding, self._handle_frame)
         self.msg_def = service.dbc.get_message_by_name(binding.message)
         self.frame_id = self.msg_def.frame_id
+
+        # The payload keys and the message fields are fixed by the config, so
+        # decide once how a decoded payload maps onto the ROS message.
+        keys = list(dict.fromkeys(binding.fields.values() or (sig.name for sig in self.msg_def.signals)))
+        sample = msg_type()
+        if hasattr(sample, 'data') and len(keys) == 1:
+            self._apply = _build_single_data_setter(keys[0])
+        else:
+            self._apply = _build_multi_field_setter(tuple(k for k in keys if hasattr(sample, k)))
+        self._msg_cls = msg_type
+        self._pub_publish = self.pub.publish
+
+        service.register_rx_binding(binding, self._handle_frame)
         node.get_logger().info(
             f"RX bind: DBC:{self.msg_def.name} (id=0x{self.frame_id:X}) -> {self.topic}"
         )
 
     def _handle_frame(self, payload: Dict[str, Any], binding: RxBindingConfig):
-        msg = self.msg_type()
-        if hasattr(msg, 'data') and len(payload) == 1:
-            msg.data = next(iter(payload.values()))
-        else:
-            for field, value in payload.items():
-                if hasattr(msg, field):
-                    setattr(msg, field, value)
-        self.pub.publish(msg)
+        msg = self._msg_cls()
+        self._apply(payload, msg)
+        self._pub_publish(msg)
 
     def shutdown(self):
         if self.pub:
@@ -10,25 +10,88 @@ teams can build on the same infrastructure without pulling in rclpy.
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import ctypes
+import errno
+import functools
+import hashlib
 import logging
+import os
+import pickle
+import select
+import selectors
+import socket
+import struct
+import sys
+import tempfile
 import threading
+import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence
 
 import can
 import cantools
 import yaml
 
+from .codec import compile_decoder, compile_encoder
+
 
 LOG = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed loader; fall back to the pure-Python one.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed DBCs are pickled under the user's cache directory
+# ($XDG_CACHE_HOME/td_can_bridges, default ~/.cache/td_can_bridges).
+_DBC_CACHE_SUBDIR = "td_can_bridges"
+
+# Upper bound on how long an RX thread polling a driver without a file
+# descriptor blocks before re-checking for shutdown.
+_RX_TIMEOUT = 1.0
+
+# Number of distinct payloads each FrameDecoder remembers.
+_DECODE_CACHE_SIZE = 32
+
+# Size of the 11-bit standard CAN identifier space.
+_STD_ID_COUNT = 0x800
+_STD_ID_MASK = 0x7FF
+_EXT_ID_MASK = 0x1FFFFFFF
+
+# Classic SocketCAN frames read per recvmmsg() call.
+_RX_BATCH = 16
+
+# struct can_frame: u32 can_id (host order), u8 len, 3 pad bytes, 8 data bytes.
+_CAN_FRAME = struct.Struct("=IB3x")
+_CAN_FRAME_SIZE = 16
+_CAN_EFF_FLAG = 0x80000000
+_CAN_RTR_ERR_FLAGS = 0x60000000
+
+# Default depth of the per-bus TX queue. When it is full the oldest pending
+# frame is dropped: a newer command supersedes a stale one.
+_DEFAULT_TX_QUEUE = 256
+
+# Minimum seconds between two "TX failed" warnings for one bus; failures in
+# between are counted and reported with the next warning.
+_TX_ERROR_LOG_INTERVAL = 5.0
+
+# Default depth of the RX handoff queue. 0 runs RX handlers on the receiving
+# thread; otherwise decoded frames wait for drain() and the oldest is dropped
+# when it is full.
+_DEFAULT_RX_QUEUE = 0
+
+# Default SO_RCVBUF for SocketCAN sockets, so bursts aren't dropped by the
+# kernel while the RX thread is busy. ``rcvbuf: 0`` keeps the system default.
+_DEFAULT_RCVBUF = 1 << 20
+
 
 # ---------------------------------------------------------------------------
 # Configuration dataclasses
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TxBindingConfig:
     """Configuration for a transmitted DBC message.
 
@@ -44,7 +107,7 @@ class TxBindingConfig:
     metadata: Mapping[str, Any] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RxBindingConfig:
     """Configuration for a received DBC message.
 
@@ -59,7 +122,7 @@ class RxBindingConfig:
     metadata: Mapping[str, Any] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BusConfig:
     """Description of a single SocketCAN interface."""
 
@@ -70,12 +133,15 @@ class BusConfig:
     fd: bool = False
     dbitrate: Optional[int] = None
     filters: Optional[Iterable[MutableMapping[str, int]]] = None
+    rcvbuf: int = _DEFAULT_RCVBUF
+    tx_queue: int = _DEFAULT_TX_QUEUE
+    rx_queue: int = _DEFAULT_RX_QUEUE
     tx_bindings: Mapping[str, TxBindingConfig] = field(default_factory=dict)
     rx_bindings: Mapping[str, RxBindingConfig] = field(default_factory=dict)
     metadata: Mapping[str, Any] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BridgeConfig:
     """Full YAML configuration describing one or more CAN buses."""
 
@@ -83,12 +149,34 @@ class BridgeConfig:
     buses: List[BusConfig]
     logging: Mapping[str, Any] = field(default_factory=dict)
     qos: Mapping[str, Any] = field(default_factory=dict)
+    buses_by_name: Mapping[str, BusConfig] = field(init=False, repr=False, compare=False)
 
-    def get_bus(self, name: str) -> Optional[BusConfig]:
+    def __post_init__(self) -> None:
+        by_name: Dict[str, BusConfig] = {}
         for bus in self.buses:
-            if bus.name == name:
-                return bus
-        return None
+            by_name.setdefault(bus.name, bus)  # first definition wins, as before
+        object.__setattr__(self, "buses_by_name", by_name)
+
+    def get_bus(self, name: str) -> Optional[BusConfig]:
+        return self.buses_by_name.get(name)
+
+
+# YAML keys the loader interprets; anything else is kept as metadata.
+_BINDING_KEYS = frozenset({"dbc_message", "fields"})
+_BUS_KEYS = frozenset({
+    "name",
+    "interface",
+    "dbc_file",
+    "bitrate",
+    "fd",
+    "dbitrate",
+    "filters",
+    "rcvbuf",
+    "tx_queue",
+    "rx_queue",
+    "tx_topics",
+    "rx_frames",
+})
 
 
 def _require_keys(data: Mapping[str, Any], required: Iterable[str], context: str) -> None:
@@ -101,14 +189,24 @@ def load_bridge_config(path: Path | str) -> BridgeConfig:
     """Parse a YAML configuration file and return a :class:`BridgeConfig`.
 
     Relative DBC paths are resolved relative to the YAML file location.
+    Parsed configs are cached per file path, modification time and size, so
+    repeated loads of an unchanged file skip the YAML parse. Each call returns
+    a private copy. Use :func:`clear_config_cache` to force a re-read.
     """
 
     cfg_path = Path(path).expanduser().resolve()
     if not cfg_path.exists():
         raise FileNotFoundError(cfg_path)
 
-    with cfg_path.open("r", encoding="utf-8") as stream:
-        raw = yaml.safe_load(stream) or {}
+    stat = cfg_path.stat()
+    return copy.deepcopy(_load_bridge_config_cached(str(cfg_path), stat.st_mtime_ns, stat.st_size))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_bridge_config_cached(path_str: str, mtime_ns: int, size: int) -> BridgeConfig:
+    cfg_path = Path(path_str)
+    with cfg_path.open("rb") as stream:
+        raw = yaml.load(stream, Loader=_YAML_LOADER) or {}
 
     buses_cfg: List[BusConfig] = []
     for idx, bus_entry in enumerate(raw.get("buses", [])):
@@ -123,7 +221,7 @@ def load_bridge_config(path: Path | str) -> BridgeConfig:
         for key, spec in (bus_entry.get("tx_topics") or {}).items():
             _require_keys(spec, ["dbc_message"], f"{context}.tx_topics['{key}']")
             fields = spec.get("fields", {}) or {}
-            metadata = {k: v for k, v in spec.items() if k not in {"dbc_message", "fields"}}
+            metadata = {k: v for k, v in spec.items() if k not in _BINDING_KEYS}
             tx_bindings[key] = TxBindingConfig(
                 key=key,
                 message=spec["dbc_message"],
@@ -134,7 +232,7 @@ def load_bridge_config(path: Path | str) -> BridgeConfig:
         rx_bindings: Dict[str, RxBindingConfig] = {}
         for key, spec in (bus_entry.get("rx_frames") or {}).items():
             message_name = spec.get("dbc_message", key)
-            metadata = {k: v for k, v in spec.items() if k not in {"fields", "dbc_message"}}
+            metadata = {k: v for k, v in spec.items() if k not in _BINDING_KEYS}
             fields = spec.get("fields", {}) or {}
             rx_bindings[key] = RxBindingConfig(
                 key=key,
@@ -143,17 +241,7 @@ def load_bridge_config(path: Path | str) -> BridgeConfig:
                 metadata=metadata,
             )
 
-        metadata = {k: v for k, v in bus_entry.items() if k not in {
-            "name",
-            "interface",
-            "dbc_file",
-            "bitrate",
-            "fd",
-            "dbitrate",
-            "filters",
-            "tx_topics",
-            "rx_frames",
-        }}
+        metadata = {k: v for k, v in bus_entry.items() if k not in _BUS_KEYS}
 
         buses_cfg.append(
             BusConfig(
@@ -164,6 +252,9 @@ def load_bridge_config(path: Path | str) -> BridgeConfig:
                 fd=bus_entry.get("fd", False),
                 dbitrate=bus_entry.get("dbitrate"),
                 filters=bus_entry.get("filters"),
+                rcvbuf=bus_entry.get("rcvbuf", _DEFAULT_RCVBUF),
+                tx_queue=bus_entry.get("tx_queue", _DEFAULT_TX_QUEUE),
+                rx_queue=bus_entry.get("rx_queue", _DEFAULT_RX_QUEUE),
                 tx_bindings=tx_bindings,
                 rx_bindings=rx_bindings,
                 metadata=metadata,
@@ -178,52 +269,265 @@ def load_bridge_config(path: Path | str) -> BridgeConfig:
     )
 
 
+def clear_config_cache() -> None:
+    """Drop the configs cached by :func:`load_bridge_config`."""
+
+    _load_bridge_config_cached.cache_clear()
+
+
 # ---------------------------------------------------------------------------
 # Runtime service implementation
 
 
+def load_dbc(path: Path | str):
+    """Load a DBC file, sharing one parsed database per file across buses.
+
+    The cache is keyed by path, modification time and size, so an edited
+    file is re-read. The returned database is shared and must not be
+    modified.
+
+    The parsed database is also pickled under ``$XDG_CACHE_HOME/td_can_bridges``
+    (default ``~/.cache``), and later processes load that instead of
+    re-parsing as long as the DBC and the cantools version are unchanged.
+    Cache files not owned by the current user, or writable by anyone else,
+    are ignored.
+    """
+
+    dbc_path = Path(path).expanduser().resolve()
+    st = dbc_path.stat()
+    return _load_dbc_cached(str(dbc_path), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_dbc_cached(path_str: str, mtime_ns: int, size: int):
+    key = (cantools.__version__, path_str, mtime_ns, size)
+    cache_path = _dbc_cache_path(key)
+    dbc = _read_dbc_cache(cache_path, key)
+    if dbc is None:
+        dbc = cantools.database.load_file(path_str)
+        _write_dbc_cache(cache_path, key, dbc)
+    return dbc
+
+
+def _dbc_cache_path(key: tuple) -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    digest = hashlib.sha256(repr(key[1:]).encode()).hexdigest()[:32]
+    return Path(base) / _DBC_CACHE_SUBDIR / f"{Path(key[1]).stem}-{digest}.pkl"
+
+
+def _is_private(st: os.stat_result) -> bool:
+    # Unpickling runs code, so only trust what this user wrote and no one
+    # else can modify.
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def _read_dbc_cache(cache_path: Path, key: tuple):
+    try:
+        if not _is_private(os.stat(cache_path.parent)):
+            LOG.debug("Ignoring DBC cache in shared directory %s", cache_path.parent)
+            return None
+        fd = os.open(cache_path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except FileNotFoundError:
+        return None
+    except OSError:
+        LOG.debug("Ignoring unreadable DBC cache %s", cache_path, exc_info=True)
+        return None
+    try:
+        with os.fdopen(fd, "rb") as handle:
+            if not _is_private(os.fstat(handle.fileno())):
+                LOG.debug("Ignoring DBC cache %s not private to this user", cache_path)
+                return None
+            cached_key, dbc = pickle.load(handle)
+    except Exception:
+        LOG.debug("Ignoring unreadable DBC cache %s", cache_path, exc_info=True)
+        return None
+    return dbc if cached_key == key else None
+
+
+def _write_dbc_cache(cache_path: Path, key: tuple, dbc) -> None:
+    tmp_name = None
+    try:
+        cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # NamedTemporaryFile creates the file with mode 0600.
+        with tempfile.NamedTemporaryFile("wb", dir=cache_path.parent, prefix=cache_path.name, delete=False) as tmp:
+            tmp_name = tmp.name
+            pickle.dump((key, dbc), tmp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_path)
+    except Exception:
+        # No writable home (e.g. a locked-down service account) just means
+        # re-parsing; the cache is only an optimization.
+        LOG.debug("Could not write DBC cache %s", cache_path, exc_info=True)
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
 class FrameEncoder:
-    """Encode named payloads to CAN frames using a DBC."""
+    """Encode named payloads to CAN frames using a DBC.
+
+    Command topics often repeat the same values as a keep-alive, so the last
+    signal values and their encoded bytes are remembered and reused when the
+    next payload matches. Set ``dedupe_tx: false`` on a TX binding to always
+    re-encode.
+
+    ``frame`` is a preconstructed message that :meth:`CanBusService.send`
+    refills under ``frame_lock`` instead of building a new
+    :class:`can.Message` per send, on buses it cannot write to directly.
+
+    ``field_order`` is the order :meth:`encode_vector_data` expects values in:
+    the binding's field aliases, or the DBC signal order without aliases.
+    """
+
+    __slots__ = (
+        "binding",
+        "msg_def",
+        "alias_to_signal",
+        "field_order",
+        "signal_order",
+        "frame",
+        "frame_lock",
+        "_alias_pairs",
+        "_frame_id",
+        "_is_extended_id",
+        "_can_id",
+        "_fast_encode",
+        "_fast_encode_vector",
+        "_dedupe",
+        "_last",
+    )
 
     def __init__(self, dbc, binding: TxBindingConfig):
         self.binding = binding
         self.msg_def = dbc.get_message_by_name(binding.message)
-        self.alias_to_signal = dict(binding.fields)
-
-    def encode(self, payload: Mapping[str, Any]) -> can.Message:
-        if not isinstance(payload, Mapping):
-            raise TypeError("payload must be a mapping of field -> value")
-
-        values: Dict[str, Any] = {}
+        self.alias_to_signal = binding.fields
+        self._alias_pairs = tuple(self.alias_to_signal.items())
         if self.alias_to_signal:
-            for alias, signal in self.alias_to_signal.items():
-                if alias not in payload:
-                    raise KeyError(f"Missing field '{alias}' for binding '{self.binding.key}'")
-                values[signal] = payload[alias]
+            self.field_order = tuple(self.alias_to_signal)
+            self.signal_order = tuple(self.alias_to_signal.values())
         else:
-            values = dict(payload)
+            self.field_order = self.signal_order = tuple(sig.name for sig in self.msg_def.signals)
+        self._frame_id = self.msg_def.frame_id
+        self._is_extended_id = self.msg_def.is_extended_frame
+        self._can_id = self._frame_id | (_CAN_EFF_FLAG if self._is_extended_id else 0)
+        self._fast_encode = compile_encoder(self.msg_def)
+        self._fast_encode_vector = compile_encoder(self.msg_def, self.signal_order)
+        self._dedupe = bool(binding.metadata.get("dedupe_tx", True))
+        # (signal values, encoded data), replaced as one tuple so concurrent
+        # callers never see values paired with another payload's bytes.
+        self._last: Optional[tuple[Any, bytes]] = None
+        self.frame = can.Message(
+            arbitration_id=self._frame_id,
+            data=bytes(self.msg_def.length),
+            is_extended_id=self._is_extended_id,
+        )
+        self.frame_lock = threading.Lock()
+
+    def encode(self, payload: Mapping[str, Any]) -> can.Message:
+        """Return a new :class:`can.Message` carrying ``payload``."""
 
-        data = self.msg_def.encode(values)
         return can.Message(
-            arbitration_id=self.msg_def.frame_id,
-            data=data,
-            is_extended_id=self.msg_def.is_extended_frame,
+            arbitration_id=self._frame_id,
+            data=self.encode_data(payload),
+            is_extended_id=self._is_extended_id,
         )
 
+    def encode_data(self, payload: Mapping[str, Any]) -> bytes:
+        """Return the encoded frame payload for ``payload``.
+
+        ``payload`` must be a mapping keyed by the binding's field aliases (or
+        by signal name when the binding has none); it is not modified.
+        """
+
+        if self._alias_pairs:
+            try:
+                values = {signal: payload[alias] for alias, signal in self._alias_pairs}
+            except KeyError as exc:
+                raise KeyError(f"Missing field '{exc.args[0]}' for binding '{self.binding.key}'") from None
+        elif self._dedupe:
+            # Copied because it is kept for comparison with the next payload.
+            values = dict(payload)
+        else:
+            values = payload
+
+        return self._encode(values, self._fast_encode, values)
+
+    def encode_vector_data(self, values: Sequence[Any]) -> bytes:
+        """Return the encoded frame payload for ``values`` given in
+        ``field_order``."""
+
+        values = tuple(values)
+        if len(values) != len(self.signal_order):
+            raise ValueError(
+                f"Expected {len(self.signal_order)} values for binding '{self.binding.key}', got {len(values)}"
+            )
+        return self._encode(values, self._fast_encode_vector, None)
+
+    def _encode(self, values: Any, fast_encode, signals: Optional[Dict[str, Any]]) -> bytes:
+        # ``values`` is what ``fast_encode`` takes and what is deduped on;
+        # ``signals`` is the same payload keyed by signal name for cantools.
+        last = self._last
+        if last is not None and last[0] == values:
+            return last[1]
+        data = None
+        if fast_encode is not None:
+            data = fast_encode(values)
+        if data is None:
+            if signals is None:
+                signals = dict(zip(self.signal_order, values))
+            data = self.msg_def.encode(signals)
+        if self._dedupe:
+            self._last = (values, data)
+        return data
+
 
 class FrameDecoder:
-    """Decode CAN frames to user-friendly dictionaries."""
+    """Decode CAN frames to user-friendly dictionaries.
+
+    Decoding is a pure function of the payload, and many devices repeat the
+    same bytes for long stretches (status bits, heartbeats, idle telemetry),
+    so recent results can be memoized per payload. The cache only pays off
+    for messages that fall back to cantools; a generated decoder is about as
+    fast as the lookup. ``decode_cache`` on an RX binding overrides the
+    default.
+    """
+
+    __slots__ = ("binding", "msg_def", "signal_to_alias", "_fast_decode", "_cache")
 
     def __init__(self, dbc, binding: RxBindingConfig):
         self.binding = binding
         self.msg_def = dbc.get_message_by_name(binding.message)
-        self.signal_to_alias = dict(binding.fields)
+        self.signal_to_alias = binding.fields
+        self._fast_decode = compile_decoder(self.msg_def, self.signal_to_alias)
+        self._cache: Optional[OrderedDict[bytes, Dict[str, Any]]] = (
+            OrderedDict() if binding.metadata.get("decode_cache", self._fast_decode is None) else None
+        )
 
     @property
     def frame_id(self) -> int:
         return self.msg_def.frame_id
 
-    def decode(self, raw_bytes: bytes) -> Dict[str, Any]:
+    def decode(self, raw_bytes: bytes | bytearray | memoryview) -> Dict[str, Any]:
+        cache = self._cache
+        if cache is None:
+            return self._decode(raw_bytes)
+
+        key = raw_bytes if isinstance(raw_bytes, bytes) else bytes(raw_bytes)
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+            return dict(cached)
+
+        decoded = self._decode(key)
+        cache[key] = decoded
+        if len(cache) > _DECODE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return dict(decoded)
+
+    def _decode(self, raw_bytes: bytes | bytearray | memoryview) -> Dict[str, Any]:
+        if self._fast_decode is not None:
+            return self._fast_decode(raw_bytes)
         decoded = self.msg_def.decode(raw_bytes)
         if self.signal_to_alias:
             return {alias: decoded.get(signal) for signal, alias in self.signal_to_alias.items()}
@@ -233,30 +537,130 @@ class FrameDecoder:
 RxHandler = Callable[[Dict[str, Any], RxBindingConfig], None]
 
 
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+class _BatchReceiver:
+    """Read up to ``batch`` classic CAN frames per syscall with ``recvmmsg(2)``.
+
+    Frames land in one preallocated buffer and are handed out as
+    ``(arbitration_id, is_extended_id, data)`` without building
+    :class:`can.Message` objects. Raises ``OSError`` if libc lacks
+    ``recvmmsg``; callers then fall back to ``bus.recv``.
+    """
+
+    def __init__(self, sock: socket.socket, batch: int = _RX_BATCH):
+        libc = ctypes.CDLL(None, use_errno=True)
+        try:
+            recvmmsg = libc.recvmmsg
+        except AttributeError as exc:
+            raise OSError(errno.ENOSYS, "recvmmsg is not available") from exc
+        recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+        recvmmsg.restype = ctypes.c_int
+        self._recvmmsg = recvmmsg
+
+        self.sock = sock
+        self.batch = batch
+        self._buf = bytearray(batch * _CAN_FRAME_SIZE)
+        self._view = memoryview(self._buf)
+        base = ctypes.addressof((ctypes.c_char * len(self._buf)).from_buffer(self._buf))
+        self._iov = (_IoVec * batch)()
+        self._msgs = (_MMsgHdr * batch)()
+        for idx in range(batch):
+            self._iov[idx].iov_base = base + idx * _CAN_FRAME_SIZE
+            self._iov[idx].iov_len = _CAN_FRAME_SIZE
+            self._msgs[idx].msg_hdr.msg_iov = ctypes.pointer(self._iov[idx])
+            self._msgs[idx].msg_hdr.msg_iovlen = 1
+
+    def read(self) -> List[tuple[int, bool, bytes]]:
+        """Return the frames currently queued on the socket, without blocking."""
+
+        count = self._recvmmsg(self.sock.fileno(), self._msgs, self.batch, socket.MSG_DONTWAIT, None)
+        if count < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            raise OSError(err, os.strerror(err))
+
+        frames = []
+        view = self._view
+        for offset in range(0, count * _CAN_FRAME_SIZE, _CAN_FRAME_SIZE):
+            can_id, length = _CAN_FRAME.unpack_from(self._buf, offset)
+            if can_id & _CAN_RTR_ERR_FLAGS:
+                continue  # remote and error frames carry no DBC payload
+            if can_id & _CAN_EFF_FLAG:
+                frames.append((can_id & _EXT_ID_MASK, True, view[offset + 8 : offset + 8 + length].tobytes()))
+            else:
+                frames.append((can_id & _STD_ID_MASK, False, view[offset + 8 : offset + 8 + length].tobytes()))
+        return frames
+
+
 class CanBusService:
     """Manage a SocketCAN interface backed by a DBC file."""
 
     def __init__(self, cfg: BusConfig):
         self.cfg = cfg
-        self.dbc = cantools.database.load_file(str(cfg.dbc_file))
+        self.dbc = load_dbc(cfg.dbc_file)
         self.bus = self._open_bus(cfg)
         self._tx_bindings: Dict[str, FrameEncoder] = {}
-        self._rx_bindings: Dict[int, tuple[FrameDecoder, RxBindingConfig, RxHandler]] = {}
+        # Standard IDs index a flat list; extended IDs go through a dict.
+        self._rx_std: List[Optional[tuple[FrameDecoder, RxBindingConfig, RxHandler]]] = [None] * _STD_ID_COUNT
+        self._rx_ext: Dict[int, tuple[FrameDecoder, RxBindingConfig, RxHandler]] = {}
         self._stop = threading.Event()
         self._rx_thread: Optional[threading.Thread] = None
+        self._batch = self._open_batch_receiver()
+        # The same native classic-CAN socket takes raw struct can_frame writes.
+        self._tx_sock: Optional[socket.socket] = self._batch.sock if self._batch is not None else None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_fd: Optional[int] = None
+        # Self-pipe that lets shutdown() wake an RX thread blocked in select().
+        self._wake_r: Optional[socket.socket] = None
+        self._wake_w: Optional[socket.socket] = None
+
+        # Callers only enqueue; one sender thread owns bus.send, so a slow or
+        # full bus never blocks a ROS executor or event loop thread. The
+        # thread is started by start() or by the first queued send.
+        self._tx_queue: Optional[deque[tuple[FrameEncoder, bytes]]] = (
+            deque(maxlen=cfg.tx_queue) if cfg.tx_queue else None
+        )
+        self._tx_cv = threading.Condition()
+        self._tx_thread: Optional[threading.Thread] = None
+
+        # With rx_queue set, decoded frames are handed to whichever thread
+        # calls drain() (e.g. a ROS timer) instead of running handlers here.
+        self._rx_queue: Optional[deque[tuple[RxHandler, Dict[str, Any], RxBindingConfig]]] = (
+            deque(maxlen=cfg.rx_queue) if cfg.rx_queue else None
+        )
+        self._rx_notify: Optional[Callable[[], None]] = None
 
         if cfg.filters:
-            try:
-                self.bus.set_filters(list(cfg.filters))
-            except Exception:  # pragma: no cover - depends on driver support
-                LOG.warning("[%s] failed to apply CAN filters", cfg.name, exc_info=True)
+            self._apply_filters(list(cfg.filters))
 
     # ------------------------------------------------------------------
     # Configuration helpers
 
-    def register_tx_binding(self, binding: TxBindingConfig) -> None:
+    def register_tx_binding(self, binding: TxBindingConfig) -> FrameEncoder:
         LOG.debug("[%s] register TX binding %s -> %s", self.cfg.name, binding.key, binding.message)
-        self._tx_bindings[binding.key] = FrameEncoder(self.dbc, binding)
+        encoder = FrameEncoder(self.dbc, binding)
+        self._tx_bindings[binding.key] = encoder
+        return encoder
 
     def register_rx_binding(self, binding: RxBindingConfig, handler: RxHandler) -> None:
         decoder = FrameDecoder(self.dbc, binding)
@@ -266,79 +670,423 @@ class CanBusService:
             binding.message,
             decoder.frame_id,
         )
-        self._rx_bindings[decoder.frame_id] = (decoder, binding, handler)
+        entry = (decoder, binding, handler)
+        # An ID above 0x7FF can only travel as an extended frame, even if the
+        # DBC doesn't mark it so; _dispatch looks such IDs up in _rx_ext too.
+        if decoder.msg_def.is_extended_frame or decoder.frame_id >= _STD_ID_COUNT:
+            self._rx_ext[decoder.frame_id] = entry
+        else:
+            self._rx_std[decoder.frame_id] = entry
+        if not self.cfg.filters:
+            self._apply_filters(self._rx_filters())
 
     # ------------------------------------------------------------------
     # Runtime operations
 
     def start(self) -> None:
+        self._stop.clear()
+        self._start_tx()
         if self._rx_thread and self._rx_thread.is_alive():
             return
-        self._stop.clear()
+        if self._wake_r is None and self._rx_fileno() is not None:
+            self._wake_r, self._wake_w = socket.socketpair()
         self._rx_thread = threading.Thread(target=self._rx_loop, name=f"{self.cfg.name}-rx", daemon=True)
         self._rx_thread.start()
 
+    def attach_event_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Receive on ``loop`` via ``add_reader`` instead of a background thread.
+
+        Handlers then run on the event loop thread, woken by socket
+        readiness. Use this in place of :meth:`start`. Raises
+        ``NotImplementedError`` if the bus driver exposes no file descriptor.
+        """
+
+        self.detach_event_loop()
+        fd = self.bus.fileno()
+        loop.add_reader(fd, self._on_readable)
+        self._loop, self._loop_fd = loop, fd
+
+    def detach_event_loop(self) -> None:
+        if self._loop is not None:
+            self._loop.remove_reader(self._loop_fd)
+            self._loop = self._loop_fd = None
+
     def shutdown(self) -> None:
         self._stop.set()
+        if self._tx_thread:
+            with self._tx_cv:
+                self._tx_cv.notify()
+            self._tx_thread.join(timeout=_RX_TIMEOUT)
+            self._tx_thread = None
         if self._rx_thread:
-            self._rx_thread.join(timeout=1.0)
+            if self._wake_w is not None:
+                try:
+                    self._wake_w.send(b"\0")
+                except OSError:  # pragma: no cover - socket already closed
+                    pass
+            self._rx_thread.join(timeout=_RX_TIMEOUT + 0.5)
             self._rx_thread = None
+        for sock in (self._wake_r, self._wake_w):
+            if sock:
+                sock.close()
+        self._wake_r = self._wake_w = None
+        self.detach_event_loop()
         try:
             self.bus.shutdown()
         except Exception:  # pragma: no cover - depends on driver support
             LOG.debug("[%s] error during bus shutdown", self.cfg.name, exc_info=True)
 
     def send(self, key: str, payload: Mapping[str, Any]) -> None:
-        if key not in self._tx_bindings:
+        encoder = self._tx_encoder(key)
+        self._enqueue(encoder, encoder.encode_data(payload), payload)
+
+    def send_vector(self, key: str, values: Sequence[Any]) -> None:
+        """Like :meth:`send`, with ``values`` given positionally in the
+        binding's ``field_order`` instead of as a mapping."""
+
+        encoder = self._tx_encoder(key)
+        self._enqueue(encoder, encoder.encode_vector_data(values), values)
+
+    def set_rx_notify(self, notify: Optional[Callable[[], None]]) -> None:
+        """Call ``notify()`` from the receiving thread after each frame is
+        queued for :meth:`drain`, e.g. to trigger a ROS guard condition.
+        Only used with ``rx_queue``; pass ``None`` to remove it."""
+
+        self._rx_notify = notify
+
+    def drain(self, max_items: int = 256) -> int:
+        """Run the handlers of up to ``max_items`` queued RX frames on the
+        calling thread and return how many ran. Only used with ``rx_queue``."""
+
+        pending = self._rx_queue
+        if pending is None:
+            return 0
+        popleft = pending.popleft
+        count = 0
+        while count < max_items:
+            try:
+                handler, payload, binding = popleft()
+            except IndexError:
+                break
+            count += 1
+            try:
+                handler(payload, binding)
+            except Exception:
+                LOG.exception("[%s] RX handler for %s failed", self.cfg.name, binding.message)
+        return count
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+
+    def _tx_encoder(self, key: str) -> FrameEncoder:
+        encoder = self._tx_bindings.get(key)
+        if encoder is None:
             raise KeyError(f"Unknown TX binding '{key}'")
-        frame = self._tx_bindings[key].encode(payload)
+        return encoder
+
+    def _enqueue(self, encoder: FrameEncoder, data: bytes, payload: Any) -> None:
         LOG.debug(
             "[%s] TX 0x%X (%s) %s",
             self.cfg.name,
-            frame.arbitration_id,
-            self._tx_bindings[key].msg_def.name,
+            encoder.msg_def.frame_id,
+            encoder.msg_def.name,
             payload,
         )
-        self.bus.send(frame)
-
-    # ------------------------------------------------------------------
-    # Internal helpers
+        if self._tx_queue is None:
+            self._transmit(encoder, data)
+            return
+        with self._tx_cv:
+            if self._tx_thread is None:
+                self._start_tx()
+            self._tx_queue.append((encoder, data))
+            self._tx_cv.notify()
+
+    def _start_tx(self) -> None:
+        if self._tx_queue is None:
+            return
+        with self._tx_cv:
+            if self._stop.is_set():
+                raise can.CanOperationError(f"[{self.cfg.name}] service is shut down")
+            if self._tx_thread is None or not self._tx_thread.is_alive():
+                self._tx_thread = threading.Thread(target=self._tx_loop, name=f"{self.cfg.name}-tx", daemon=True)
+                self._tx_thread.start()
 
     @staticmethod
     def _open_bus(cfg: BusConfig) -> can.BusABC:
         kwargs = dict(interface="socketcan", channel=cfg.interface, bitrate=cfg.bitrate, fd=cfg.fd)
         if cfg.fd and cfg.dbitrate:
             kwargs["data_bitrate"] = cfg.dbitrate
-        return can.Bus(**kwargs)
+        bus = can.Bus(**kwargs)
+        sock = getattr(bus, "socket", None)
+        if cfg.rcvbuf and sock is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, cfg.rcvbuf)
+            except OSError:  # pragma: no cover - depends on kernel limits
+                LOG.warning("[%s] failed to set SO_RCVBUF=%d", cfg.name, cfg.rcvbuf, exc_info=True)
+        return bus
+
+    def _rx_filters(self) -> List[Dict[str, Any]]:
+        """Exact-match acceptance filters for every registered RX frame ID."""
+
+        filters: List[Dict[str, Any]] = [
+            {"can_id": frame_id, "can_mask": _STD_ID_MASK, "extended": False}
+            for frame_id, entry in enumerate(self._rx_std)
+            if entry is not None
+        ]
+        filters.extend(
+            {"can_id": frame_id, "can_mask": _EXT_ID_MASK, "extended": True}
+            for frame_id in self._rx_ext
+        )
+        return filters
+
+    def _apply_filters(self, filters: List[Dict[str, Any]]) -> None:
+        try:
+            self.bus.set_filters(filters)
+        except Exception:  # pragma: no cover - depends on driver support
+            LOG.warning("[%s] failed to apply CAN filters", self.cfg.name, exc_info=True)
+
+    def _transmit(self, encoder: FrameEncoder, data: bytes) -> None:
+        sock = self._tx_sock
+        if sock is not None and len(data) <= 8:
+            # Write the frame ourselves: python-can's send() logs, rebuilds the
+            # frame and select()s on every call. MSG_DONTWAIT fails fast on a
+            # full kernel TX queue rather than stall.
+            frame_bytes = _CAN_FRAME.pack(encoder._can_id, len(data)) + data + bytes(8 - len(data))
+            try:
+                sock.send(frame_bytes, socket.MSG_DONTWAIT)
+            except OSError as exc:
+                raise can.CanOperationError(f"Failed to transmit: {exc.strerror}", exc.errno) from exc
+            return
+
+        frame = encoder.frame
+        with encoder.frame_lock:
+            frame.data = data
+            # Fail fast on a full kernel TX queue rather than stall.
+            self.bus.send(frame, timeout=0.0)
+
+    def _tx_loop(self) -> None:
+        pending = self._tx_queue
+        cv = self._tx_cv
+        stop_is_set = self._stop.is_set
+        transmit = self._transmit
+        failures = 0
+        next_report = 0.0
+        while True:
+            with cv:
+                while not pending and not stop_is_set():
+                    cv.wait()
+                if not pending:
+                    return  # stopped and drained
+                batch = list(pending)
+                pending.clear()
+            for encoder, data in batch:
+                try:
+                    transmit(encoder, data)
+                except Exception as exc:
+                    # A disconnected bus fails every frame; don't log each one.
+                    failures += 1
+                    now = time.monotonic()
+                    if now >= next_report:
+                        LOG.warning(
+                            "[%s] TX 0x%X failed: %s (%d failure(s) since last report)",
+                            self.cfg.name,
+                            encoder.msg_def.frame_id,
+                            exc,
+                            failures,
+                        )
+                        failures = 0
+                        next_report = now + _TX_ERROR_LOG_INTERVAL
+
+    def _open_batch_receiver(self) -> Optional[_BatchReceiver]:
+        # recvmmsg only pays off on a native classic-CAN socket; CAN-FD frames
+        # have a different layout, and other interfaces keep using recv().
+        sock = getattr(self.bus, "socket", None)
+        if self.cfg.fd or not sys.platform.startswith("linux") or not isinstance(sock, socket.socket):
+            return None
+        try:
+            return _BatchReceiver(sock)
+        except OSError:
+            LOG.debug("[%s] recvmmsg unavailable, using bus.recv", self.cfg.name, exc_info=True)
+            return None
+
+    def _rx_loop(self) -> None:
+        # This thread is the bus's only consumer, so it reads the socket
+        # directly instead of going through a Notifier and a reader queue.
+        # Per-frame lookups are bound to locals once, outside the loop.
+        # With a file descriptor it blocks in select() until a frame arrives
+        # or shutdown() writes to the wake socket, so an idle bus never wakes
+        # it; drivers without one are polled with a timeout instead.
+        name = self.cfg.name
+        recv = self.bus.recv
+        stop_is_set = self._stop.is_set
+        dispatch = self._dispatch
+        read_ready = self._read_ready
+        fd = self._rx_fileno() if self._wake_r is not None else None
+        waitables = (fd, self._wake_r.fileno()) if fd is not None else ()
+        LOG.info("[%s] RX loop started", name)
+        try:
+            while not stop_is_set():
+                try:
+                    if fd is None:
+                        msg = recv(timeout=_RX_TIMEOUT)
+                        if msg is not None:
+                            dispatch(msg.arbitration_id, msg.is_extended_id, msg.data)
+                    elif fd in select.select(waitables, (), ())[0]:
+                        read_ready()
+                except (can.CanError, OSError, ValueError):
+                    if stop_is_set():
+                        break  # bus closed underneath us by shutdown()
+                    LOG.exception("[%s] CAN receive failed", name)
+                    break
+        finally:
+            LOG.info("[%s] RX loop stopped", name)
+
+    def _rx_fileno(self) -> Optional[int]:
+        if self._batch is not None:
+            return self._batch.sock.fileno()
+        try:
+            fd = self.bus.fileno()
+        except NotImplementedError:
+            return None
+        return fd if fd >= 0 else None
+
+    def _on_readable(self) -> None:
+        try:
+            self._read_ready()
+        except (can.CanError, OSError, ValueError):
+            LOG.exception("[%s] CAN receive failed", self.cfg.name)
+            self.detach_event_loop()
+
+    def _read_ready(self) -> None:
+        """Read and dispatch whatever is queued on the bus, without blocking."""
+
+        dispatch = self._dispatch
+        if self._batch is None:
+            msg = self.bus.recv(timeout=0.0)
+            if msg is not None:
+                dispatch(msg.arbitration_id, msg.is_extended_id, msg.data)
+            return
+
+        read = self._batch.read
+        while True:
+            frames = read()
+            for arbitration_id, is_extended_id, data in frames:
+                dispatch(arbitration_id, is_extended_id, data)
+            if len(frames) < self._batch.batch:
+                return
+
+    def _dispatch(self, arbitration_id: int, is_extended_id: bool, data: bytes | bytearray) -> None:
+        if is_extended_id or arbitration_id >= _STD_ID_COUNT:
+            binding_entry = self._rx_ext.get(arbitration_id)
+        else:
+            binding_entry = self._rx_std[arbitration_id]
+        if not binding_entry:
+            return
+        decoder, binding, handler = binding_entry
+        try:
+            # cantools decodes any bytes-like object, and every frame
+            # from recv() carries its own buffer, so no copy is needed.
+            payload = decoder.decode(data)
+            LOG.debug(
+                "[%s] RX 0x%X (%s) %s",
+                self.cfg.name,
+                arbitration_id,
+                decoder.msg_def.name,
+                payload,
+            )
+            if self._rx_queue is not None:
+                self._rx_queue.append((handler, payload, binding))
+                notify = self._rx_notify
+                if notify is not None:
+                    notify()
+            else:
+                handler(payload, binding)
+        except Exception:
+            LOG.exception("[%s] Failed to decode frame 0x%X", self.cfg.name, arbitration_id)
+
+
+class SharedRxLoop:
+    """Receive for several :class:`CanBusService` instances on one thread.
+
+    Buses that expose a file descriptor are multiplexed with :mod:`selectors`,
+    so N buses cost one thread and one wait per wake-up instead of N threads
+    contending for the GIL. Services whose driver has no ``fileno()`` fall
+    back to their own RX thread. Use this instead of ``service.start()``, and
+    call :meth:`shutdown` before shutting the services down.
+    """
+
+    def __init__(self, services: Iterable[CanBusService]):
+        self.services = list(services)
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wake_r: Optional[socket.socket] = None
+        self._wake_w: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+
+        selector = selectors.DefaultSelector()
+        for service in self.services:
+            try:
+                fd = service.bus.fileno()
+            except NotImplementedError:
+                fd = -1
+            if fd < 0:
+                LOG.info("[%s] bus has no file descriptor; using a dedicated RX thread", service.cfg.name)
+                service.start()
+                continue
+            selector.register(fd, selectors.EVENT_READ, service)
+        if not selector.get_map():
+            selector.close()
+            return
+
+        # Self-pipe so shutdown() can wake a select() with no timeout.
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._selector = selector
+
+        self._thread = threading.Thread(target=self._rx_loop, name="can-rx", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        if self._thread:
+            try:
+                self._wake_w.send(b"\0")
+            except OSError:  # pragma: no cover - socket already closed
+                pass
+            self._thread.join(timeout=_RX_TIMEOUT + 0.5)
+            self._thread = None
+        if self._selector:
+            self._selector.close()
+            self._selector = None
+        for sock in (self._wake_r, self._wake_w):
+            if sock:
+                sock.close()
+        self._wake_r = self._wake_w = None
 
     def _rx_loop(self) -> None:
-        reader = can.BufferedReader()
-        notifier = can.Notifier(self.bus, [reader], timeout=0.01)
-        LOG.info("[%s] RX loop started", self.cfg.name)
+        selector = self._selector
+        LOG.info("Shared RX loop started for %d bus(es)", len(selector.get_map()) - 1)
         try:
-            while not self._stop.is_set():
-                msg = reader.get_message(timeout=0.1)
-                if msg is None:
-                    continue
-                binding_entry = self._rx_bindings.get(msg.arbitration_id)
-                if not binding_entry:
-                    continue
-                decoder, binding, handler = binding_entry
+            while True:
                 try:
-                    payload = decoder.decode(bytes(msg.data))
-                    LOG.debug(
-                        "[%s] RX 0x%X (%s) %s",
-                        self.cfg.name,
-                        msg.arbitration_id,
-                        decoder.msg_def.name,
-                        payload,
-                    )
-                    handler(payload, binding)
-                except Exception:
-                    LOG.exception("[%s] Failed to decode frame 0x%X", self.cfg.name, msg.arbitration_id)
+                    events = selector.select()
+                except (OSError, ValueError):
+                    LOG.exception("Shared RX select failed")
+                    return
+                for key, _ in events:
+                    service = key.data
+                    if service is None:
+                        return  # woken by shutdown()
+                    try:
+                        service._read_ready()
+                    except (can.CanError, OSError, ValueError):
+                        LOG.exception("[%s] CAN receive failed", service.cfg.name)
+                        selector.unregister(key.fileobj)
         finally:
-            notifier.stop()
-            LOG.info("[%s] RX loop stopped", self.cfg.name)
+            LOG.info("Shared RX loop stopped")
 
 
 __all__ = [
@@ -346,7 +1094,10 @@ __all__ = [
     "BusConfig",
     "CanBusService",
     "RxBindingConfig",
+    "SharedRxLoop",
     "TxBindingConfig",
+    "clear_config_cache",
     "load_bridge_config",
+    "load_dbc",
 ]
 
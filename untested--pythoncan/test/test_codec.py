@@ -0,0 +1,145 @@
+"""Cross-check the generated codecs against cantools."""
+
+import random
+
+import cantools
+import pytest
+from cantools.database.errors import DecodeError, EncodeError
+
+from td_can_bridges.codec import compile_decoder, compile_encoder
+
+DBC = """VERSION ""
+
+BU_: NODE
+
+BO_ 256 LeAligned: 8 NODE
+ SG_ u8 : 0|8@1+ (1,0) [0|255] "" NODE
+ SG_ s16 : 8|16@1- (0.01,-5) [-300|300] "" NODE
+ SG_ u32 : 32|32@1+ (1,0) [0|4294967295] "" NODE
+
+BO_ 257 LePacked: 4 NODE
+ SG_ flag : 0|1@1+ (1,0) [0|1] "" NODE
+ SG_ mode : 1|3@1+ (1,0) [0|7] "" NODE
+ SG_ temp : 4|12@1- (0.5,10) [-1000|1000] "" NODE
+ SG_ count : 16|10@1+ (1,0) [0|1023] "" NODE
+
+BO_ 258 BigEndian: 8 NODE
+ SG_ position : 7|16@0- (0.001,0) [-32.768|32.767] "" NODE
+ SG_ velocity : 23|12@0+ (0.1,-200) [-200|209.5] "" NODE
+ SG_ torque : 27|20@0- (0.01,0) [-5000|5000] "" NODE
+
+BO_ 259 Mixed: 6 NODE
+ SG_ le_word : 0|16@1+ (1,0) [0|65535] "" NODE
+ SG_ be_word : 23|16@0- (2,1) [-65535|65535] "" NODE
+ SG_ tail : 32|7@1+ (1,0) [0|127] "" NODE
+
+BO_ 260 Floats: 8 NODE
+ SG_ value : 0|32@1- (1,0) [0|0] "" NODE
+ SG_ gain : 32|32@1- (0.5,1) [0|0] "" NODE
+
+SIG_VALTYPE_ 260 value : 1;
+SIG_VALTYPE_ 260 gain : 1;
+"""
+
+DB = cantools.database.load_string(DBC, "dbc")
+MESSAGES = [msg.name for msg in DB.messages]
+INTEGER_MESSAGES = [name for name in MESSAGES if name != "Floats"]
+
+
+def _frames(msg_def, count=200):
+    rng = random.Random(msg_def.frame_id)
+    return [bytes(rng.randrange(256) for _ in range(msg_def.length)) for _ in range(count)]
+
+
+def _cantools_encode(msg_def, values):
+    """cantools' frame, or ``None`` where it rejects the values (the compiled
+    encoder must then return ``None`` so the caller falls back to it)."""
+    try:
+        return msg_def.encode(values)
+    except EncodeError:
+        return None
+
+
+def _assert_same(expected, actual):
+    assert list(actual) == list(expected)
+    for key, value in expected.items():
+        assert actual[key] == value
+        assert type(actual[key]) is type(value)
+
+
+@pytest.mark.parametrize("name", MESSAGES)
+def test_decoder_matches_cantools(name):
+    msg_def = DB.get_message_by_name(name)
+    decode = compile_decoder(msg_def, {})
+    assert decode is not None
+    for frame in _frames(msg_def):
+        _assert_same(msg_def.decode(frame), decode(bytearray(frame)))
+
+
+def test_decoder_aliases():
+    msg_def = DB.get_message_by_name("LePacked")
+    decode = compile_decoder(msg_def, {"count": "n", "flag": "on", "missing": "gone"})
+    frame = _frames(msg_def, 1)[0]
+    expected = msg_def.decode(frame)
+    assert decode(frame) == {"n": expected["count"], "on": expected["flag"], "gone": None}
+
+
+@pytest.mark.parametrize("name", MESSAGES)
+def test_decoder_rejects_short_frames(name):
+    msg_def = DB.get_message_by_name(name)
+    decode = compile_decoder(msg_def, {})
+    short = bytes(msg_def.length - 1)
+    with pytest.raises(DecodeError):
+        msg_def.decode(short)
+    with pytest.raises(DecodeError):
+        decode(short)
+
+
+@pytest.mark.parametrize("name", INTEGER_MESSAGES)
+def test_encoder_matches_cantools(name):
+    msg_def = DB.get_message_by_name(name)
+    encode = compile_encoder(msg_def)
+    assert encode is not None
+    encoded = 0
+    for frame in _frames(msg_def):
+        values = msg_def.decode(frame)
+        expected = _cantools_encode(msg_def, values)
+        assert encode(values) == expected
+        encoded += expected is not None
+    assert encoded
+
+
+@pytest.mark.parametrize("name", INTEGER_MESSAGES)
+def test_positional_encoder_matches_cantools(name):
+    msg_def = DB.get_message_by_name(name)
+    order = [sig.name for sig in reversed(msg_def.signals)]
+    encode = compile_encoder(msg_def, order)
+    for frame in _frames(msg_def, 50):
+        values = msg_def.decode(frame)
+        assert encode([values[key] for key in order]) == _cantools_encode(msg_def, values)
+
+
+@pytest.mark.parametrize("name", INTEGER_MESSAGES)
+def test_encoder_defers_out_of_range_to_cantools(name):
+    msg_def = DB.get_message_by_name(name)
+    encode = compile_encoder(msg_def)
+    values = msg_def.decode(bytes(msg_def.length))
+    for sig in msg_def.signals:
+        for bad in (sig.maximum + 10 * sig.scale, sig.minimum - 10 * sig.scale):
+            payload = dict(values, **{sig.name: bad})
+            with pytest.raises(EncodeError):
+                msg_def.encode(payload)
+            assert encode(payload) is None
+
+
+def test_encoder_defers_bad_payloads_to_cantools():
+    msg_def = DB.get_message_by_name("LePacked")
+    encode = compile_encoder(msg_def)
+    values = msg_def.decode(bytes(msg_def.length))
+    assert encode({key: values[key] for key in list(values)[1:]}) is None
+    assert encode(dict(values, flag="1")) is None
+    assert encode(dict(values, extra=0)) is None
+
+
+def test_float_signals_have_no_compiled_encoder():
+    assert compile_encoder(DB.get_message_by_name("Floats")) is None
@@ -0,0 +1,133 @@
+"""Receive through ``CanBusService.attach_event_loop`` on an asyncio loop."""
+
+import asyncio
+import socket
+import threading
+from collections import deque
+from pathlib import Path
+
+import can
+import cantools
+import pytest
+
+from td_can_bridges.service import CanBusService, load_bridge_config
+
+CONFIG = Path(__file__).resolve().parents[1] / "config" / "vcan_blink_demo.yaml"
+
+
+class _SocketPairBus(can.BusABC):
+    """In-memory bus whose file descriptor turns readable once per frame."""
+
+    def __init__(self, **kwargs):
+        self._r, self._w = socket.socketpair()
+        self._r.setblocking(False)
+        self._pending = deque()
+        self.sent = []
+        super().__init__(channel="test", **kwargs)
+
+    def inject(self, msg):
+        self._pending.append(msg)
+        self._w.send(b"\0")
+
+    def fileno(self):
+        return self._r.fileno()
+
+    def _recv_internal(self, timeout):
+        try:
+            self._r.recv(1)
+        except BlockingIOError:
+            return None, False
+        return self._pending.popleft(), False
+
+    def send(self, msg, timeout=None):
+        self.sent.append(msg)
+
+    def shutdown(self):
+        self._r.close()
+        self._w.close()
+        super().shutdown()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(CanBusService, "_open_bus", staticmethod(lambda cfg: _SocketPairBus()))
+    svc = CanBusService(load_bridge_config(CONFIG).get_bus("vcan_demo"))
+    yield svc
+    svc.shutdown()
+
+
+def test_rx_handlers_run_on_the_event_loop(service):
+    binding = service.cfg.rx_bindings["device_b_inbox"]
+    frame_id = service.dbc.get_message_by_name(binding.message).frame_id
+    frames = [bytes([i % 2, i]) for i in range(3)]
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        received = []
+        done = asyncio.Event()
+
+        def handler(payload, rx_binding):
+            received.append((payload, rx_binding, threading.get_ident()))
+            if len(received) == len(frames):
+                done.set()
+
+        service.register_rx_binding(binding, handler)
+        service.attach_event_loop(loop)
+        for data in frames:
+            service.bus.inject(can.Message(arbitration_id=frame_id, data=data, is_extended_id=False))
+        await asyncio.wait_for(done.wait(), timeout=2.0)
+        service.detach_event_loop()
+        return received
+
+    received = asyncio.run(scenario())
+
+    assert [payload for payload, _, _ in received] == [
+        {"blink": i % 2, "seq": i} for i in range(3)
+    ]
+    assert all(rx_binding is binding for _, rx_binding, _ in received)
+    # No RX thread: handlers ran on the thread driving the loop.
+    assert {ident for _, _, ident in received} == {threading.get_ident()}
+    assert service._rx_thread is None
+
+
+def test_detach_stops_delivery(service):
+    binding = service.cfg.rx_bindings["device_b_inbox"]
+    frame_id = service.dbc.get_message_by_name(binding.message).frame_id
+    received = []
+    service.register_rx_binding(binding, lambda payload, rx_binding: received.append(payload))
+
+    async def scenario():
+        service.attach_event_loop(asyncio.get_running_loop())
+        service.detach_event_loop()
+        service.bus.inject(can.Message(arbitration_id=frame_id, data=b"\x01\x07", is_extended_id=False))
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert received == []
+
+
+def test_unflagged_id_above_standard_range_is_received(service):
+    # cantools' parser rejects this, but a Message edited or built in code can
+    # carry a non-extended frame_id past 0x7FF.
+    service.dbc = cantools.database.load_string(
+        'VERSION ""\nBU_: A B\n'
+        "BO_ 256 BlinkFromA: 2 A\n"
+        ' SG_ blink_state : 0|8@1+ (1,0) [0|255] "" B\n'
+        ' SG_ sequence : 8|8@1+ (1,0) [0|255] "" B\n',
+        "dbc",
+    )
+    msg_def = service.dbc.get_message_by_name("BlinkFromA")
+    msg_def.frame_id = 0x1234
+    assert not msg_def.is_extended_frame
+    received = []
+    binding = service.cfg.rx_bindings["device_b_inbox"]
+    service.register_rx_binding(binding, lambda payload, rx_binding: received.append(payload))
+
+    async def scenario():
+        service.attach_event_loop(asyncio.get_running_loop())
+        service.bus.inject(can.Message(arbitration_id=0x1234, data=b"\x01\x05", is_extended_id=True))
+        await asyncio.sleep(0.05)
+        service.detach_event_loop()
+
+    asyncio.run(scenario())
+    assert received == [{"blink": 1, "seq": 5}]